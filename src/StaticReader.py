@@ -1,5 +1,6 @@
-import pygame.mixer
+import argparse
 import asyncio
+import time
 import flet as ft
 from flet import (
     Page,
@@ -14,57 +15,91 @@ from flet import (
     KeyboardEvent,
     ControlEvent,
 )
-from docx import Document
-from pathlib import Path
-
-# -----------------------------
-# Pygame.mixer setup - Audio
-# -----------------------------
-pygame.mixer.init(
-    frequency=44100,
-    size=-16,
-    channels=2,
-    buffer=512,  # affects latency
+from analytics import distribution_summary
+from audio import (
+    CHANNEL_CLICKS,
+    CHANNEL_HOVER,
+    CHANNEL_KEYS,
+    CHANNEL_WORD,
+    AudioEngine,
+    Sfx,
 )
+from book_cache import BookCache
+from chunking import MAX_CHUNK_WORDS, MIN_CHUNK_WORDS
+from event_log import EventLog
+from importers import supported_extensions
+from library import Library
+from probes import probes
+from reader_engine import CHAPTER, PARAGRAPH, SENTENCE, ReaderEngine
+from search import SearchIndex
+from server import DEFAULT_HOST, DEFAULT_PORT, ReaderServer, book_paths
+from sessions import SESSION_DIR, MemorySessionStore, ReadingSession, SessionStore
+from terminal import read_in_terminal
+from ui_updates import UpdateCoalescer
+from word_store import BackgroundLoader, LazyWords
+
+
+def main(
+    page: Page, audio: AudioEngine | None = None, server: ReaderServer | None = None
+) -> None:
+    # One call per window, or per connection in server mode (`server` holds
+    # what all connections share)
+
+    # Batched handlers send their marked controls in one update when they return
+    ui = UpdateCoalescer(page)
 
+    # -----------------------------
+    # Reader (book, cursor, speed, pacing & scheduling)
+    # -----------------------------
+    # The UI below is only a view over the engine; tokenized books from
+    # earlier imports come from the cache
+    engine = ReaderEngine(server.books.book_cache if server is not None else BookCache())
+    scheduler = engine.scheduler
 
-def load_sfx(path: str, volume: float = 1) -> pygame.mixer.Sound:
-    sound = pygame.mixer.Sound(path)
-    sound.set_volume(volume)
-    return sound
-
-
-def main(page: Page) -> None:
     # -----------------------------
     # App State
     # -----------------------------
-    words = []
-    word_index = 0
-    is_active = False
     is_file_valid = False
     show_ui = True
     is_shift_pressed = False
     is_ctrl_pressed = False
-    is_reading_complete = False
     reader_task = None
+    import_loader = None
+    show_load_progress = False  # txt_the_word shows import progress
+    resume_reading = False  # start reading once the next document is ready
+    # Server mode reads the server's books (not the client's files), silently
+    is_desktop = server is None
+
+    # -----------------------------
+    # Sessions (position, settings & bookmarks per book)
+    # -----------------------------
+    # (in memory per connection in server mode)
+    sessions = SessionStore() if is_desktop else MemorySessionStore()
+    session: ReadingSession | None = None
+    BOOKMARK_NAME_WORDS = 4  # words of context used as a bookmark's name
+
+    # -----------------------------
+    # Search (inverted index, built once the book is fully loaded)
+    # -----------------------------
+    search_index: SearchIndex | None = None
+    is_search_focused = False  # keys go to the search field, not the reader
 
     # -----------------------------
-    # Reading Speed [WPM] (Properties)
+    # Scheduling (measured vs requested WPM)
     # -----------------------------
-    wpm = 60
-    lower_limit = 1
-    upper_limit = 1000
+    MEASURED_WPM_REFRESH = 1.0  # seconds between measured-WPM label refreshes
 
     # -----------------------------
-    # Smart Pacing
+    # Performance Overlay (timing probes)
     # -----------------------------
-    use_smart_pacing = False
-    base_delay = 60 / wpm
-    word = None
-    word_length = None
-    AVG_WORD_LEN = 4.5
-    LENGTH_WEIGHT = 0.3
-    MIN_FACTOR = 0.7
+    PERF_OVERLAY_REFRESH = 0.5  # seconds
+    TRACE_DIR = SESSION_DIR.parent / "traces"
+
+    # -----------------------------
+    # Event Log (inputs & render times, for replay.py)
+    # -----------------------------
+    # Server connections aren't recorded
+    event_log = EventLog(clock=scheduler.clock, enabled=is_desktop)
 
     # -----------------------------
     # SFX - Audio
@@ -73,11 +108,19 @@ def main(page: Page) -> None:
     ICON_NOT_MUTED = ft.Icons.MUSIC_NOTE
     ICON_MUTED = ft.Icons.MUSIC_OFF
 
-    def play_sfx(sound: pygame.mixer.Sound):
+    # The mixer is opened and the sounds decoded on the engine's own thread
+    # (silent if there's no audio device) -> the window comes up right away
+    if server is not None:
+        audio = server.audio
+    elif audio is None:
+        audio = AudioEngine()
+
+    def play_sfx(sound: Sfx):
         nonlocal mute_audio
         if not mute_audio:
-            sound.play()
+            audio.play(sound)
 
+    @ui.batched
     def toggle_mute_audio(e: ControlEvent) -> None:
         nonlocal mute_audio, btn_toggle_mute_audio
         mute_audio = not mute_audio
@@ -86,17 +129,30 @@ def main(page: Page) -> None:
         else:
             btn_toggle_mute_audio.icon = ICON_NOT_MUTED
             play_sfx(sfx_button_start_click)
-        page.update()
-
-    sfx_word_appear = load_sfx("assets/audio/_UsedSFX/TOON_Pop.wav", volume=0.7)
-    sfx_button_hover = load_sfx("assets/audio/_UsedSFX/Bonk Hover A.wav", volume=0.4)
-    sfx_button_start_click = load_sfx("assets/audio/_UsedSFX/Light Click A_Start.wav")
-    sfx_button_stop_click = load_sfx("assets/audio/_UsedSFX/Light Click B_Stop.wav")
-    sfx_writing = load_sfx(
-        "assets/audio/_UsedSFX/ui_menu_button_beep_08.wav", volume=0.9
+        ui.mark(btn_toggle_mute_audio)
+
+    # Word pops and key beeps coalesce: at high WPM / fast typing they'd
+    # otherwise restart before the previous one has finished
+    sfx_word_appear = audio.load(
+        "assets/audio/_UsedSFX/TOON_Pop.wav", CHANNEL_WORD, volume=0.7, coalesce=True
+    )
+    sfx_button_hover = audio.load(
+        "assets/audio/_UsedSFX/Bonk Hover A.wav", CHANNEL_HOVER, volume=0.4
+    )
+    sfx_button_start_click = audio.load(
+        "assets/audio/_UsedSFX/Light Click A_Start.wav", CHANNEL_CLICKS
+    )
+    sfx_button_stop_click = audio.load(
+        "assets/audio/_UsedSFX/Light Click B_Stop.wav", CHANNEL_CLICKS
     )
-    sfx_reading_complete = load_sfx(
-        "assets/audio/_UsedSFX/collect_item_sparkle_pop_03.wav"
+    sfx_writing = audio.load(
+        "assets/audio/_UsedSFX/ui_menu_button_beep_08.wav",
+        CHANNEL_KEYS,
+        volume=0.9,
+        coalesce=True,
+    )
+    sfx_reading_complete = audio.load(
+        "assets/audio/_UsedSFX/collect_item_sparkle_pop_03.wav", CHANNEL_CLICKS
     )
 
     # -----------------------------
@@ -111,82 +167,432 @@ def main(page: Page) -> None:
     # page.window.full_screen = True
 
     text_color = "ORANGE"
+    WORD_FONT_SIZE = 45
+    CHUNK_FONT_SIZE = 34  # chunks of up to 5 words must still fit
 
     txt_the_word = Text(
         value="Import a file to begin",
-        size=45,
+        size=WORD_FONT_SIZE,
+        text_align=ft.TextAlign.CENTER,
         weight=ft.FontWeight.BOLD,
         color=text_color,
     )
 
+    # ORP mode: the word is split around its pivot letter, which stays on a
+    # fixed anchor (the two halves get equal, fixed-width boxes)
+    ORP_PIVOT_COLOR = "RED"
+    ORP_SIDE_WIDTH = 420
+
+    def orp_text(**kwargs) -> Text:
+        return Text(
+            size=WORD_FONT_SIZE,
+            weight=ft.FontWeight.BOLD,
+            no_wrap=True,
+            **kwargs,
+        )
+
+    txt_orp_before = orp_text(color=text_color)
+    txt_orp_pivot = orp_text(color=ORP_PIVOT_COLOR)
+    txt_orp_after = orp_text(color=text_color)
+    orp_word = Row(
+        spacing=0,
+        alignment=ft.MainAxisAlignment.CENTER,
+        visible=False,
+        controls=[
+            ft.Container(
+                txt_orp_before, width=ORP_SIDE_WIDTH, alignment=ft.alignment.center_right
+            ),
+            txt_orp_pivot,
+            ft.Container(
+                txt_orp_after, width=ORP_SIDE_WIDTH, alignment=ft.alignment.center_left
+            ),
+        ],
+    )
+
+    def show_text(value: str) -> None:
+        # Messages and chunks (never ORP-aligned)
+        txt_the_word.value = value
+        ui.mark(txt_the_word)
+        if orp_word.visible:
+            orp_word.visible = False
+            txt_the_word.visible = True
+            ui.mark(orp_word)
+
+    def show_frame(start: int, stop: int) -> None:
+        if not engine.use_orp or stop - start > 1:
+            show_text(engine.frame_text(start, stop))
+            return
+
+        # Pivots are precomputed per word -> just three slices
+        before, pivot, after = engine.orp_parts(start)
+        txt_orp_before.value = before
+        txt_orp_pivot.value = pivot
+        txt_orp_after.value = after
+        ui.mark(txt_orp_before, txt_orp_pivot, txt_orp_after)
+        if not orp_word.visible:
+            orp_word.visible = True
+            txt_the_word.visible = False
+            ui.mark(orp_word, txt_the_word)
+
+    def show_current() -> None:
+        show_frame(engine.word_index, engine.frame_end(engine.word_index))
+
+    @ui.batched
     def set_btn_visibilities(**kwargs) -> None:
         nonlocal btn_start, btn_stop, btn_reset
         for key, value in kwargs.items():
             if key == "btn_start":
                 btn_start.visible = value
+                ui.mark(btn_start)
             elif key == "btn_stop":
                 btn_stop.visible = value
+                ui.mark(btn_stop)
             elif key == "btn_reset":
                 btn_reset.visible = value
-
-        page.update()
+                ui.mark(btn_reset)
 
     # -----------------------------
     # File Import Logic
     # -----------------------------
-    def import_file(path: str) -> str:
-        nonlocal is_file_valid, txt_show_ui_info
+    @probes.timed("import.open")
+    def import_file(path: str) -> LazyWords:
+        if server is not None:
+            return server.books.open(path)
+        return engine.open_file(path)
+
+    # Picked documents are read in order; the next ones are prefetched and
+    # cached while the current one is read
+    library = Library(
+        import_file,
+        on_loaded=engine.book_cache.store,
+        pool=server.prefetch_pool if server is not None else None,
+    )
 
-        file_path = Path(path)
-        suffix = file_path.suffix.lower()
+    def format_load_progress() -> str:
+        words = engine.words
+        loaded_more = "" if words.is_complete else "+"
+        text = f"Loaded {len(words)}{loaded_more} words"
+        progress = words.progress
+        if progress is not None and progress < 1:
+            text += f" ({progress:.0%})"
+        return text
+
+    def cancel_import() -> None:
+        nonlocal import_loader
+        if import_loader is not None:
+            import_loader.cancel()
+            import_loader = None
+
+    # The import callbacks run on the loader's worker thread
+    @ui.batched
+    def on_import_ready(loader: BackgroundLoader) -> None:
+        nonlocal is_file_valid, show_load_progress, session, resume_reading
+        if loader is not import_loader:
+            return
 
-        if suffix == ".txt":
-            # is_file_valid = True
+        engine.load(loader.source)
+        is_file_valid = True
+        event_log.open(len(engine.words), engine.book_id, library.current)
+        show_ui_info(None)
+
+        # Restored before it becomes the current session, so the handlers
+        # used to apply it don't save half-restored state
+        loaded_session = None
+        if engine.book_id:
+            loaded_session = sessions.load(engine.book_id)
+            if loaded_session is None:
+                # A new book starts with the current settings
+                loaded_session = ReadingSession(engine.book_id)
+                engine.save_to(loaded_session)
+            elif resume_reading:
+                # Moving on through the library keeps the current settings
+                word_index = loaded_session.word_index
+                engine.save_to(loaded_session)
+                loaded_session.word_index = word_index
+            restore_session(loaded_session)
+        session = loaded_session
+
+        if engine.word_index > 0 or resume_reading:
+            show_load_progress = False
+            show_current()
+        else:
+            show_load_progress = True
+            show_text(format_load_progress())
+        update_reading_stats()
+        if show_ui:
+            set_btn_visibilities(
+                btn_stop=False, btn_start=True, btn_reset=engine.word_index > 0
+            )
 
-            return file_path.read_text(encoding="utf-8", errors="ignore")
+        # Moving on from the previous document
+        if resume_reading:
+            resume_reading = False
+            start_reader(None)
 
-        if suffix == ".docx":
-            doc = Document(str(file_path))
-            # is_file_valid = True
-            return "\n".join(p.text for p in doc.paragraphs)
+    @ui.batched
+    def on_import_progress(loader: BackgroundLoader) -> None:
+        if loader is not import_loader:
+            return
 
-        raise ValueError(f"Unsupported file type: {suffix}")
+        if show_load_progress:
+            show_text(format_load_progress())
+        update_reading_stats()
 
-    def on_file_picked(e: ft.FilePickerResultEvent):
-        nonlocal words, word_index, is_file_valid
+    @ui.batched
+    def on_import_error(loader: BackgroundLoader, ex: Exception) -> None:
+        nonlocal is_file_valid, import_loader
+        if loader is not import_loader:
+            return
 
+        import_loader = None
+        if loader.source is None:
+            # Failed before the first word -> nothing to read
+            show_text(str(ex))
+            engine.close()
+            is_file_valid = False
+            hide_ui_info(None)
+        else:
+            # Keep what was loaded so far
+            txt_reading_stats.value = f"Import stopped: {ex}"
+        ui.mark(txt_reading_stats)
+
+    @ui.batched
+    def on_import_complete(loader: BackgroundLoader) -> None:
+        nonlocal search_index
+
+        # Fully tokenized -> cache it for the next import
+        engine.book_cache.store(loader.source)
+        if loader is import_loader:
+            shared = server.books.shared(engine.book_id) if server is not None else None
+            if shared is not None:
+                # Built once by the server (cancelling a built index is a no-op)
+                search_index = shared.search_index
+                engine.analyze(shared.stats)
+            else:
+                search_index = SearchIndex(loader.source)
+                search_index.start()
+                engine.analyze()
+            update_book_stats()
+
+    @ui.batched
+    def open_document(index: int, keep_reading: bool = False) -> None:
+        # Switches to the library's document `index` (instant when it was
+        # prefetched). The reader must already be stopped.
+        nonlocal is_file_valid, import_loader, session, search_index, resume_reading
+
+        save_session()
+        cancel_import()
+        session = None
+        if search_index is not None:
+            search_index.cancel()
+            search_index = None
+        # The library decides when the previous book is closed
+        library.release(engine.detach())
+        is_file_valid = False
+        resume_reading = keep_reading
+        hide_ui_info(None)
+        show_text("Loading...")
+        txt_reading_stats.value = ""
+        txt_book_stats.value = ""
+        ui.mark(txt_reading_stats, txt_book_stats)
+        if show_ui:
+            set_btn_visibilities(btn_stop=False, btn_start=False, btn_reset=False)
+
+        import_loader = BackgroundLoader(
+            lambda: library.take(index),
+            on_ready=on_import_ready,
+            on_progress=on_import_progress,
+            on_error=on_import_error,
+            on_complete=on_import_complete,
+            close_source=library.release,
+        )
+        import_loader.start()
+
+    @ui.batched
+    def on_file_picked(e: ft.FilePickerResultEvent):
         if not e.files:
             return
 
-        try:
-            stop_reader(e)
-            text = import_file(e.files[0].path)
-            words = text.split()
-            word_index = 0
-            is_file_valid = True
-            show_ui_info(e)
-            txt_the_word.value = f"Loaded {len(words)} words"
-            if show_ui:
-                set_btn_visibilities(btn_stop=False, btn_start=True, btn_reset=False)
-        except Exception as ex:
-            txt_the_word.value = str(ex)
-            is_file_valid = False
-            hide_ui_info(e)
+        stop_reader(e)  # also saves the current book's session
+        library.set_paths([f.path for f in e.files])
+        open_document(0)
 
-        page.update()
+    @ui.batched
+    def switch_document(backwards: bool) -> None:
+        index = library.next_index(backwards)
+        if index is None:
+            return
+        stop_reader(None)
+        open_document(index)
 
     file_picker = FilePicker(on_result=on_file_picked)
     page.overlay.append(file_picker)
 
+    # -----------------------------
+    # Session Logic
+    # -----------------------------
+    def save_session() -> None:
+        # Only queues a snapshot -> never blocks on the disk
+        event_log.settings(engine.wpm, engine.use_smart_pacing, engine.chunk_size, engine.use_orp)
+        if session is None:
+            return
+        engine.save_to(session)
+        sessions.save(session)
+
+    def restore_session(saved: ReadingSession) -> None:
+        # (we're on the loader thread here -> seeking to the saved position
+        # may tokenize up to it)
+        engine.restore_from(saved)
+        txt_wpm.value = str(engine.wpm)
+        slider_wpm.max = engine.upper_limit
+        slider_wpm.value = engine.wpm
+        txt_the_word.size = CHUNK_FONT_SIZE if engine.chunk_size else WORD_FONT_SIZE
+        ui.mark(txt_wpm, slider_wpm, txt_the_word)
+        adjust_use_smart_pace_state(None, engine.use_smart_pacing)
+
+    @ui.batched
+    def jump_to(index: int) -> None:
+        nonlocal show_load_progress
+
+        if not engine.jump_to(index):
+            return
+
+        show_load_progress = False
+        show_current()
+        update_book_stats()
+        save_session()
+
+    @ui.batched
+    def add_bookmark() -> None:
+        context = engine.context(BOOKMARK_NAME_WORDS)
+        if session is None or not context:
+            return
+
+        bookmark = session.add_bookmark(" ".join(context), engine.word_index)
+        save_session()
+        txt_reading_stats.value = f"Bookmarked: {bookmark.name}"
+        ui.mark(txt_reading_stats)
+
+    def jump_to_bookmark(backwards: bool) -> None:
+        if session is None:
+            return
+
+        bookmark = session.next_bookmark(engine.word_index, backwards)
+        if bookmark is not None:
+            jump_to(bookmark.word_index)
+
+    def jump_to_boundary(backwards: bool, is_shift: bool, is_ctrl: bool) -> None:
+        # Arrow keys move by sentence, Shift by paragraph, Ctrl by chapter
+        if is_ctrl:
+            target = engine.boundary(CHAPTER, backwards)
+        elif is_shift:
+            target = engine.boundary(PARAGRAPH, backwards)
+        else:
+            target = engine.boundary(SENTENCE, backwards)
+
+        if target is not None:
+            jump_to(target)
+
+    # -----------------------------
+    # Search Logic
+    # -----------------------------
+    @ui.batched
+    def open_search() -> None:
+        txt_search.visible = True
+        ui.mark(txt_search)
+        txt_search.focus()
+
+    @ui.batched
+    def close_search() -> None:
+        nonlocal is_search_focused
+        is_search_focused = False
+        txt_search.visible = False
+        ui.mark(txt_search)
+
+    def on_search_focus_change(e) -> None:
+        nonlocal is_search_focused
+        is_search_focused = e.name == "focus"
+
+    @ui.batched
+    def search_next(backwards: bool = False) -> None:
+        query = (txt_search.value or "").strip()
+        if not query or not is_file_valid:
+            return
+
+        stop_reader(None)
+        if search_index is None or not search_index.is_ready:
+            progress = search_index.progress if search_index is not None else 0
+            txt_reading_stats.value = f"Building search index... ({progress:.0%})"
+        else:
+            target = search_index.find(query, engine.word_index, backwards)
+            if target is None:  # wrap around
+                start = len(engine.words) if backwards else -1
+                target = search_index.find(query, start, backwards)
+
+            if target is None:
+                txt_reading_stats.value = f"No matches for '{query}'"
+            else:
+                jump_to(target)
+                txt_reading_stats.value = f"'{query}' found at word {target + 1}"
+        ui.mark(txt_reading_stats)
+
+    # -----------------------------
+    # Performance Overlay Logic
+    # -----------------------------
+    @ui.batched
+    def refresh_perf_overlay() -> None:
+        backend = audio.backend.name if audio.backend is not None else "starting"
+        lines = [
+            probes.format_summary() or "No samples yet",
+            f"audio ({backend}) latency {audio.latency * 1000:.1f} ms"
+            f"  played {audio.played}  dropped {audio.dropped}",
+            f"scheduler skipped sfx {scheduler.skipped_frames}  resyncs {scheduler.resyncs}",
+        ]
+        txt_perf_overlay.value = "\n".join(lines)
+        ui.mark(txt_perf_overlay)
+
+    async def perf_overlay_loop():
+        while txt_perf_overlay.visible:
+            refresh_perf_overlay()
+            await asyncio.sleep(PERF_OVERLAY_REFRESH)
+
+    @ui.batched
+    def toggle_perf_overlay() -> None:
+        txt_perf_overlay.visible = not txt_perf_overlay.visible
+        ui.mark(txt_perf_overlay)
+        if txt_perf_overlay.visible:
+            page.run_task(perf_overlay_loop)
+
+    @ui.batched
+    def export_trace() -> None:
+        path = TRACE_DIR / time.strftime("trace-%Y%m%d-%H%M%S.json")
+        try:
+            spans = probes.export_trace(path)
+            txt_reading_stats.value = f"Trace ({spans} spans) saved to {path}"
+        except OSError as ex:
+            txt_reading_stats.value = f"Trace not saved: {ex}"
+        ui.mark(txt_reading_stats)
+
+    def on_app_exit(e) -> None:
+        save_session()
+        library.close()
+        sessions.flush(timeout=2)
+        event_log.close()
+        if is_desktop:
+            audio.close()
+
+    page.on_disconnect = on_app_exit
+    page.on_close = on_app_exit
+
     # -----------------------------
     # Reader Logic (ASYNC)
     # -----------------------------
+    @ui.batched
     def reading_completed() -> None:
-        nonlocal is_active, txt_the_word, word_index, is_reading_complete
-        is_active = False
-        is_reading_complete = True
-        word_index = 0
-        txt_the_word.value = "- THE END -"
+        event_log.end()
+        engine.complete()
+        show_text("- THE END -")
+        save_session()
         if show_ui:
             set_btn_visibilities(btn_start=False, btn_stop=False, btn_reset=True)
         else:
@@ -194,128 +600,204 @@ def main(page: Page) -> None:
         play_sfx(sfx_reading_complete)
 
     async def reader_loop():
-        nonlocal \
-            base_delay, \
-            words, \
-            word, \
-            word_length, \
-            word_index, \
-            is_active, \
-            AVG_WORD_LEN, \
-            LENGTH_WEIGHT, \
-            MIN_FACTOR
-        
+        last_wpm_refresh = None
+
         try:
-            while is_active:
-                try:
-                    play_sfx(sfx_word_appear)
-
-                    txt_the_word.value = words[word_index]
-                    page.update()
-
-                    if use_smart_pacing:
-                        word = words[word_index]
-                        word_length = len(word)
-
-                        length_factor = (
-                            1.0 + ((word_length - AVG_WORD_LEN) / AVG_WORD_LEN) * LENGTH_WEIGHT
-                        )                        
-                        length_factor = max(MIN_FACTOR, length_factor)
-
-                        # Punctuation pauses
-                        punctuation_factor = 1.0
-                        if word.endswith((",", ";", ":", '"', "'", ")", "]", "}")):
-                            punctuation_factor = 1.225
-                        elif word.endswith((".", "!", "?")):
-                            punctuation_factor = 1.375
-
-                        delay = base_delay * length_factor * punctuation_factor
+            try:
+                # Each word arrives at its deadline
+                async for start, stop in engine.frames():
+                    if last_wpm_refresh is None:
+                        last_wpm_refresh = scheduler.started_at
                     else:
-                        delay = base_delay
+                        # How late the event loop woke us up
+                        probes.record("reader.loop_lag", max(scheduler.lag(), 0.0))
+
+                    # Behind schedule -> skip the word SFX to catch up
+                    started = probes.start()
+                    if not scheduler.is_behind():
+                        play_sfx(sfx_word_appear)
+                    probes.stop("reader.sfx", started)
+
+                    started = probes.start()
+                    show_frame(start, stop)
+                    probes.stop("reader.word", started)
+
+                    now = scheduler.clock()
+                    if now - last_wpm_refresh >= MEASURED_WPM_REFRESH:
+                        last_wpm_refresh = now
+                        started = probes.start()
+                        update_reading_stats()
+                        update_book_stats()
+                        save_session()
+                        probes.stop("reader.stats", started)
+
+                    # Only the word (and now and then the stats) is sent
+                    started = probes.start()
+                    ui.flush()
+                    probes.stop("reader.update", started)
+                    event_log.frame(start, stop)
+
+            except Exception:
+                reading_completed()
+                return
+
+            # Still active -> the book ended (not stopped)
+            if engine.is_active:
+                next_index = library.next_index()
+                if next_index is None:
+                    reading_completed()
+                else:
+                    # Finished -> starts over next time
+                    event_log.end()
+                    engine.complete()
+                    open_document(next_index, keep_reading=True)
+        except asyncio.CancelledError:
+            # Expected and clean
+            return
 
-                    word_index += 1
+    def update_reading_stats() -> None:
+        stats = []
 
-                    await asyncio.sleep(delay)
+        measured = scheduler.measured_wpm
+        requested = scheduler.requested_wpm
+        if measured and requested:
+            stats.append(f"Measured {measured:.0f} / Requested {requested:.0f} WPM")
 
-                    if word_index >= len(words):
-                        reading_completed()
-                        return
+        if engine.chunk_size:
+            stats.append(f"{engine.chunk_size} words per flash")
 
-                except Exception:
-                    reading_completed()
-                    return
+        if len(library) > 1:
+            stats.append(f"Document {library.position + 1}/{len(library)}")
 
-                # await asyncio.sleep(delay)
-        except asyncio.CancelledError:
-            # Expected and clean
+        txt_reading_stats.value = "  |  ".join(stats)
+        ui.mark(txt_reading_stats)
+
+    def update_book_stats() -> None:
+        # Estimates are O(1) once the book is analyzed -> refreshed on every
+        # speed / position change
+        stats = engine.stats
+        if stats is None:
             return
 
-        is_active = False
+        def duration(paced: bool, index: int = 0) -> str:
+            minutes = round(stats.reading_seconds(engine.wpm, index, paced) / 60)
+            return f"{minutes // 60} h {minutes % 60:02} min" if minutes >= 60 else f"{minutes} min"
+
+        def distribution(histogram: dict[int, int], unit: str) -> str:
+            summary = distribution_summary(histogram)
+            if not summary:
+                return f"- {unit}"
+            return (
+                f"{summary['mean']:.1f} {unit} (median {summary['p50']}, "
+                f"90% up to {summary['p90']}, max {summary['max']})"
+            )
 
+        txt_book_stats.value = (
+            f"{stats.word_count:,} words  |  "
+            f"grade {stats.automated_readability_index:.1f} (ARI), "
+            f"{stats.coleman_liau_index:.1f} (CLI)\n"
+            f"Words: {distribution(stats.word_lengths, 'characters')}  |  "
+            f"sentences: {distribution(stats.sentence_lengths, 'words')}\n"
+            f"{duration(False)} total ({duration(True)} paced)  |  "
+            f"{duration(False, engine.word_index)} left "
+            f"({duration(True, engine.word_index)} paced) at {engine.wpm} WPM"
+        )
+        ui.mark(txt_book_stats)
+
+    @ui.batched
     def start_reader(e):
-        nonlocal is_active, reader_task
+        nonlocal reader_task, show_load_progress
 
-        if not words or is_active:
+        if not engine.start():
             return
 
+        show_load_progress = False
+        save_session()  # (logs the settings it starts with)
+        event_log.start(engine.word_index)
+
         if reader_task and not reader_task.done():
             reader_task.cancel()
 
-        is_active = True
-
         if show_ui:
             set_btn_visibilities(btn_start=False, btn_stop=True, btn_reset=True)
 
         play_sfx(sfx_button_start_click)
 
-        page.update()
         reader_task = page.run_task(reader_loop)
 
+    @ui.batched
     def reset_reader(e):
-        nonlocal words, word_index, txt_the_word, is_reading_complete
+        nonlocal show_load_progress
 
-        is_reading_complete = False
-        word_index = 0
-        txt_the_word.value = "Static Reader"
+        engine.reset()
+        show_load_progress = False
+        show_text("Static Reader")
         stop_reader(e)
         if show_ui:
             set_btn_visibilities(btn_start=True, btn_stop=False, btn_reset=False)
         play_sfx(sfx_button_start_click)
 
+    @ui.batched
     def stop_reader(e):
-        nonlocal is_active, reader_task
+        nonlocal reader_task
 
-        is_active = False
+        if engine.is_active:
+            event_log.stop(engine.word_index)
+        engine.stop()
+
+        # An import that hasn't produced its first word yet is abandoned
+        if import_loader is not None and not is_file_valid:
+            cancel_import()
+            show_text("Import cancelled")
 
         if reader_task and not reader_task.done():
             reader_task.cancel()
             reader_task = None
 
+        update_reading_stats()
+        update_book_stats()
+        save_session()
+
         if show_ui:
             set_btn_visibilities(btn_start=True, btn_stop=False)
 
         play_sfx(sfx_button_stop_click)
-        page.update()
 
     # ------------------------------
     # Input Handling
     # ------------------------------
+    @probes.timed("input.keyboard")
+    @ui.batched
     def keyboard_event(ke: KeyboardEvent) -> None:
-        nonlocal is_active, is_shift_pressed, is_ctrl_pressed
+        nonlocal is_shift_pressed, is_ctrl_pressed
 
         play_sfx(sfx_writing)
         is_shift_pressed = ke.shift
         is_ctrl_pressed = ke.ctrl
 
+        if is_search_focused:
+            # Typing a query (Enter submits it via on_submit)
+            if ke.key == "Escape":
+                close_search()
+            return
+
+        event_log.key(ke.key, ke.shift, ke.ctrl)
+
         if ke.key == " ":
-            stop_reader(ke) if is_active else start_reader(ke)
-        elif ke.key.lower() == "i":
+            stop_reader(ke) if engine.is_active else start_reader(ke)
+        elif ke.key.lower() == "i" and is_desktop:
             file_picker.pick_files(
-                allow_multiple=False,
-                allowed_extensions=["txt", "docx"],
+                allow_multiple=True,
+                allowed_extensions=supported_extensions(),
             )
         elif ke.key.lower() == "q":
-            adjust_use_smart_pace_state(ke, not use_smart_pacing)
+            adjust_use_smart_pace_state(ke, not engine.use_smart_pacing)
+        elif ke.key.lower() == "c":  # Chunk mode: off -> 2 -> ... -> 5 -> off
+            cycle_chunk_size()
+        elif ke.key.lower() == "o":  # ORP alignment
+            toggle_orp()
+        elif ke.key.lower() == "l":  # Next document / Shift: previous
+            switch_document(backwards=is_shift_pressed)
         elif ke.key.lower() == "r":
             reset_reader(ke)
         elif ke.key.lower() == "m":
@@ -326,12 +808,26 @@ def main(page: Page) -> None:
             adjust_wpm(False, is_shift_pressed, is_ctrl_pressed)
         elif ke.key.lower() == "w":  # increase WPM
             adjust_wpm(True, is_shift_pressed, is_ctrl_pressed)
-        elif (ke.key.lower() == "a") & (not is_reading_complete):  # Go Back
+        elif (ke.key.lower() == "a") & (not engine.is_reading_complete):  # Go Back
             stop_reader(ke)
             move_word_pos(True, is_shift_pressed, is_ctrl_pressed)
-        elif (ke.key.lower() == "d") & (not is_reading_complete):  # Skip
+        elif (ke.key.lower() == "d") & (not engine.is_reading_complete):  # Skip
             stop_reader(ke)
             move_word_pos(False, is_shift_pressed, is_ctrl_pressed)
+        elif ke.key.lower() == "b":  # Bookmark the current position
+            add_bookmark()
+        elif (ke.key.lower() == "n") & (not engine.is_reading_complete):  # Next bookmark
+            stop_reader(ke)
+            jump_to_bookmark(backwards=is_shift_pressed)
+        elif (ke.key in ("Arrow Left", "Arrow Right")) & (not engine.is_reading_complete):
+            stop_reader(ke)
+            jump_to_boundary(ke.key == "Arrow Left", is_shift_pressed, is_ctrl_pressed)
+        elif (ke.key.lower() == "f") & is_file_valid:  # Search
+            open_search()
+        elif (ke.key.lower() == "g") & (not engine.is_reading_complete):  # Next search hit
+            search_next(backwards=is_shift_pressed)
+        elif ke.key.lower() == "p":  # Performance overlay / Shift: export trace
+            export_trace() if is_shift_pressed and is_desktop else toggle_perf_overlay()
         else:
             # print(f"UNSIGNED KEY: {ke.key}")
             pass
@@ -340,6 +836,7 @@ def main(page: Page) -> None:
 
     txt_wpm: TextField = TextField()
 
+    @ui.batched
     def mouse_tap_event(e) -> None:
         if not show_ui:
             toggle_show_ui()
@@ -347,10 +844,11 @@ def main(page: Page) -> None:
     # ------------------------------
     # Other Logic
     # ------------------------------
+    @ui.batched
     def wpm_handler(e) -> None:
-        nonlocal wpm, base_delay, lower_limit, upper_limit, slider_wpm
+        nonlocal slider_wpm
 
-        latest_valid_input = int(wpm or 60)
+        latest_valid_input = engine.wpm
 
         try:
             if str(txt_wpm.value).isdigit():
@@ -360,16 +858,10 @@ def main(page: Page) -> None:
         except (ValueError, TypeError) as e:
             print(f"ERROR: {e}")
             txt_wpm.value = str(latest_valid_input)
+            ui.mark(txt_wpm)
             return
 
-        if lower_limit <= new_wpm <= upper_limit:
-            wpm = new_wpm
-        elif new_wpm < lower_limit:
-            wpm = lower_limit
-        else:
-            wpm = upper_limit
-
-        base_delay = 60 / wpm
+        wpm = engine.set_wpm(new_wpm)
 
         if txt_wpm:
             txt_wpm.value = str(wpm)
@@ -377,12 +869,14 @@ def main(page: Page) -> None:
             # slider_wpm.label = str(wpm)
             slider_wpm.value = wpm
 
-        page.update()
+        ui.mark(txt_wpm, slider_wpm)
+        update_book_stats()
+        save_session()
 
+    @ui.batched
     def adjust_wpm(increase: bool, use_macro=False, use_micro=False) -> None:
-        nonlocal wpm, lower_limit, upper_limit, slider_wpm
+        nonlocal slider_wpm
 
-        new_wpm = wpm
         adjust_factor = 10
 
         if use_macro:
@@ -390,17 +884,7 @@ def main(page: Page) -> None:
         elif use_micro:
             adjust_factor = 1
 
-        if increase:
-            new_wpm += adjust_factor
-        else:
-            new_wpm -= adjust_factor
-
-        if lower_limit <= new_wpm <= upper_limit:
-            wpm = new_wpm
-        elif new_wpm < lower_limit:
-            wpm = lower_limit
-        else:
-            wpm = upper_limit
+        wpm = engine.adjust_wpm(adjust_factor if increase else -adjust_factor)
 
         if txt_wpm:
             txt_wpm.value = str(wpm)
@@ -408,44 +892,33 @@ def main(page: Page) -> None:
             # slider_wpm.label = str(wpm)
             slider_wpm.value = wpm
 
-        page.update()
+        ui.mark(txt_wpm, slider_wpm)
         wpm_handler(e=KeyboardEvent)
 
+    @ui.batched
     def move_word_pos(
         is_back_direction: bool, use_macro=False, use_micro=False
     ) -> None:
-        nonlocal word, words, word_index, txt_the_word, is_reading_complete
+        nonlocal txt_the_word, show_load_progress
+        show_load_progress = False
         adjust_factor = 2
-        new_index = word_index
 
         if use_macro:
             adjust_factor = 6
         elif use_micro:
             adjust_factor = 4
 
-        if is_back_direction:
-            if word_index > 0:
-                new_index -= adjust_factor
-        else:
-            if word_index < len(words) - 1:
-                new_index += adjust_factor
+        engine.move(-adjust_factor if is_back_direction else adjust_factor)
 
-        try:
-            if new_index < 0:
-                new_index = 0
-            elif new_index > len(words):
-                new_index = len(words)
-
-            word_index = new_index
-            word = words[word_index]
-        except IndexError as e:
-            print(f"Index Out of Bounds: {e}")
-
-        txt_the_word.value = word
-        page.update()
+        # Past the end -> the last word shown stays
+        if engine.current_word is not None:
+            show_current()
+        update_book_stats()
+        save_session()
 
+    @ui.batched
     def slider_wpm_handler(e) -> None:
-        nonlocal wpm, txt_wpm, base_delay, lower_limit, upper_limit, slider_wpm
+        nonlocal txt_wpm, slider_wpm
         try:
             if slider_wpm:
                 new_wpm = int(slider_wpm.value)
@@ -454,13 +927,7 @@ def main(page: Page) -> None:
         except (ValueError, TypeError) as e:
             print(f"ERROR: {e}")
             return
-        if lower_limit <= new_wpm <= upper_limit:
-            wpm = new_wpm
-        elif new_wpm < lower_limit:
-            wpm = lower_limit
-        else:
-            wpm = upper_limit
-        base_delay = 60 / wpm
+        wpm = engine.set_wpm(new_wpm)
 
         if slider_wpm:
             # slider_wpm.label = str(wpm)
@@ -468,14 +935,45 @@ def main(page: Page) -> None:
         if txt_wpm:
             txt_wpm.value = str(wpm)
 
-        page.update()
+        ui.mark(txt_wpm)
+        update_book_stats()
+        save_session()
+
+    @ui.batched
+    def cycle_chunk_size() -> None:
+        size = engine.chunk_size
+        if size >= MAX_CHUNK_WORDS:
+            size = 0
+        else:
+            size = max(size + 1, MIN_CHUNK_WORDS)
+
+        engine.set_chunk_size(size)
+
+        # Chunk mode raises the speed limit (and leaving it may lower the WPM)
+        slider_wpm.max = engine.upper_limit
+        slider_wpm.value = engine.wpm
+        txt_wpm.value = str(engine.wpm)
+        txt_the_word.size = CHUNK_FONT_SIZE if size else WORD_FONT_SIZE
+        ui.mark(slider_wpm, txt_wpm, txt_the_word)
+        update_reading_stats()
+        save_session()
+
+    @ui.batched
+    def toggle_orp() -> None:
+        engine.use_orp = not engine.use_orp
+        # Re-render the word on screen (not a message)
+        on_screen = is_file_valid and not show_load_progress and engine.word_index > 0
+        if on_screen and engine.current_word is not None:
+            show_current()
+        save_session()
 
     def playsound_btn_hover(ce: ControlEvent) -> None:
         if ce.data == "true":
             play_sfx(sfx_button_hover)
 
+    @ui.batched
     def adjust_use_smart_pace_state(e, state=None) -> None:
-        nonlocal switch_smart_pacing, use_smart_pacing, label_smart_pacing
+        nonlocal switch_smart_pacing, label_smart_pacing
 
         try:
             if state is not None:
@@ -484,10 +982,12 @@ def main(page: Page) -> None:
             print(f"Valueerror: {e}")
 
         if switch_smart_pacing:
-            use_smart_pacing = switch_smart_pacing.value
-            label_smart_pacing.color = "#8CE4FF" if use_smart_pacing else "#7C7C7C"
-            page.update()
+            engine.use_smart_pacing = switch_smart_pacing.value
+            label_smart_pacing.color = "#8CE4FF" if engine.use_smart_pacing else "#7C7C7C"
+            ui.mark(switch_smart_pacing, label_smart_pacing)
+            save_session()
 
+    @ui.batched
     def toggle_show_ui() -> None:
         nonlocal \
             label_smart_pacing, \
@@ -499,8 +999,7 @@ def main(page: Page) -> None:
             btn_stop, \
             import_button, \
             btn_toggle_mute_audio, \
-            show_ui, \
-            is_active
+            show_ui
 
         if is_file_valid:
             show_ui = not show_ui
@@ -509,24 +1008,41 @@ def main(page: Page) -> None:
             switch_smart_pacing.visible = show_ui
             txt_wpm.visible = show_ui
             slider_wpm.visible = show_ui
-            import_button.visible = show_ui
-            btn_toggle_mute_audio.visible = show_ui
+            txt_reading_stats.visible = show_ui
+            txt_book_stats.visible = show_ui
+            if not show_ui:
+                txt_search.visible = False
+            import_button.visible = show_ui and is_desktop
+            btn_toggle_mute_audio.visible = show_ui and is_desktop
 
             if show_ui:
                 set_btn_visibilities(
-                    btn_stop=is_active,
-                    btn_start=not is_active,
-                    btn_reset=not bool(word_index == 0),
+                    btn_stop=engine.is_active,
+                    btn_start=not engine.is_active,
+                    btn_reset=not bool(engine.word_index == 0),
                 )
             else:
                 btn_reset.visible = show_ui
                 btn_start.visible = show_ui
                 btn_stop.visible = show_ui
 
-            page.update()
+            ui.mark(
+                label_smart_pacing,
+                switch_smart_pacing,
+                txt_wpm,
+                slider_wpm,
+                txt_reading_stats,
+                txt_book_stats,
+                txt_search,
+                import_button,
+                btn_toggle_mute_audio,
+                btn_reset,
+                btn_start,
+                btn_stop,
+            )
 
     txt_wpm: TextField = TextField(
-        value=str(wpm),
+        value=str(engine.wpm),
         text_align=ft.TextAlign.CENTER,
         width=80,
         text_size=20,
@@ -542,9 +1058,9 @@ def main(page: Page) -> None:
     )
 
     slider_wpm: Slider = Slider(
-        value=wpm,
-        min=lower_limit,
-        max=upper_limit,
+        value=engine.wpm,
+        min=engine.lower_limit,
+        max=engine.upper_limit,
         width=333,
         thumb_color="WHITE",
         active_color="RED",
@@ -554,16 +1070,45 @@ def main(page: Page) -> None:
         on_change=slider_wpm_handler,
     )
 
+    txt_reading_stats: Text = Text(
+        value="",
+        size=12,
+        color="#7C7C7C",
+    )
+
+    txt_book_stats: Text = Text(
+        value="",
+        size=11,
+        color="#5C5C5C",
+        text_align=ft.TextAlign.CENTER,
+    )
+
+    txt_search: TextField = TextField(
+        width=333,
+        text_size=14,
+        hint_text="Search (word, phrase or prefix*)",
+        border_width=1,
+        border_radius=7,
+        border_color="#7C7C7C",
+        color="WHITE",
+        cursor_color="RED",
+        visible=False,
+        on_submit=lambda _: search_next(),
+        on_focus=on_search_focus_change,
+        on_blur=on_search_focus_change,
+    )
+
     # -----------------------------
     # Buttons
     # -----------------------------
     import_button = ElevatedButton(
         "Import File",
         on_click=lambda _: file_picker.pick_files(
-            allow_multiple=False,
-            allowed_extensions=["txt", "docx"],
+            allow_multiple=True,
+            allowed_extensions=supported_extensions(),
         ),
         on_hover=playsound_btn_hover,
+        visible=is_desktop,
     )
 
     btn_start = ElevatedButton(
@@ -603,6 +1148,7 @@ def main(page: Page) -> None:
         icon_color="WHITE",
         on_click=toggle_mute_audio,
         on_hover=playsound_btn_hover,
+        visible=is_desktop,
     )
 
     # -----------------------------
@@ -629,10 +1175,12 @@ def main(page: Page) -> None:
         nonlocal txt_show_ui_info
 
         txt_show_ui_info.visible = True
+        ui.mark(txt_show_ui_info)
 
     def hide_ui_info(e) -> None:
         nonlocal txt_show_ui_info
         txt_show_ui_info.visible = False
+        ui.mark(txt_show_ui_info)
 
     gesture_detector = ft.GestureDetector(
         on_tap=mouse_tap_event,
@@ -649,6 +1197,14 @@ def main(page: Page) -> None:
         visible=False,
     )
 
+    txt_perf_overlay: Text = Text(
+        value="",
+        size=10,
+        color="#444444",
+        font_family="monospace",
+        visible=False,
+    )
+
     # -----------------------------
     # Adding UI-Elements to Page
     # -----------------------------
@@ -680,7 +1236,11 @@ def main(page: Page) -> None:
                                     controls=[
                                         txt_wpm,
                                         slider_wpm,
+                                        txt_reading_stats,
+                                        txt_book_stats,
+                                        txt_search,
                                         txt_the_word,
+                                        orp_word,
                                         import_button,
                                         btn_start,
                                         btn_stop,
@@ -690,7 +1250,11 @@ def main(page: Page) -> None:
                             ],
                         ),
                         btn_toggle_mute_audio,
-                        txt_show_ui_info,
+                        Row(
+                            alignment=ft.MainAxisAlignment.CENTER,
+                            vertical_alignment=ft.CrossAxisAlignment.END,
+                            controls=[txt_show_ui_info, txt_perf_overlay],
+                        ),
                     ],
                 ),
             ],
@@ -698,5 +1262,54 @@ def main(page: Page) -> None:
     )
 
 
+    # Server mode starts with the server's first book
+    if server is not None and server.books.paths:
+        library.set_paths(server.books.paths)
+        open_document(0)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="StaticReader")
+    parser.add_argument(
+        "books", nargs="*", help="documents or folders (server and terminal modes)"
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--serve", action="store_true", help="serve the books to web browsers"
+    )
+    mode.add_argument(
+        "--terminal", action="store_true", help="read the first book in the terminal"
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--wpm", type=int, default=300, help="terminal mode")
+    parser.add_argument("--smart-pacing", action="store_true", help="terminal mode")
+    parser.add_argument("--chunk", type=int, default=0, help="words per flash (terminal mode)")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
-    ft.app(target=main)
+    args = parse_args()
+    if args.serve:
+        # One process, many readers: each browser tab is its own session
+        server = ReaderServer(book_paths(args.books))
+        server.start()
+        try:
+            ft.app(
+                target=lambda page: main(page, server=server),
+                view=None,  # web server only, no browser window here
+                host=args.host,
+                port=args.port,
+            )
+        finally:
+            server.close()
+    elif args.terminal:
+        paths = book_paths(args.books)
+        if not paths:
+            raise SystemExit("No book to read")
+        try:
+            asyncio.run(read_in_terminal(paths[0], args.wpm, args.smart_pacing, args.chunk))
+        except KeyboardInterrupt:
+            pass
+    else:
+        ft.app(target=main)
@@ -0,0 +1,135 @@
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain, islice
+from operator import sub
+from typing import Sequence
+
+from word_store import LazyWords
+
+
+def distribution_summary(histogram: dict[int, int]) -> dict[str, float]:
+    # Mean / median / p90 / max of a {value: count} histogram
+    total = sum(histogram.values())
+    if not total:
+        return {}
+
+    summary = {"mean": sum(v * n for v, n in histogram.items()) / total}
+    seen = 0
+    for value in sorted(histogram):
+        seen += histogram[value]
+        if "p50" not in summary and seen >= total * 0.5:
+            summary["p50"] = value
+        if seen >= total * 0.9:
+            summary["p90"] = value
+            break
+    summary["max"] = max(histogram)
+    return summary
+
+
+# -----------------------------
+# Book Statistics
+# -----------------------------
+class BookStats:
+    # One pass over a fully tokenized book's per-word arrays (lengths,
+    # punctuation classes, pacing factors, sentence starts) with C-level
+    # builtins -- no per-word Python code. Afterwards every estimate is O(1)
+    # or O(BLOCK): the pacing factors are summed per block once, so the
+    # remaining paced time at any position only adds up a partial block.
+
+    BLOCK = 1024  # words per precomputed pacing sum
+
+    __slots__ = (
+        "word_count",
+        "sentence_count",
+        "paragraph_count",
+        "chapter_count",
+        "letter_count",
+        "word_lengths",
+        "sentence_lengths",
+        "total_factor",
+        "_factors",
+        "_factor_prefix",
+    )
+
+    def __init__(self, words: LazyWords) -> None:
+        n = len(words)
+        # (a book ending in . ! ? has a sentence start right after its end)
+        starts = words.sentence_starts
+        sentence_count = bisect_left(starts, n)
+        self.word_count = n
+        self.sentence_count = sentence_count
+        self.paragraph_count = len(words.paragraph_starts)
+        self.chapter_count = len(words.chapter_starts)
+
+        # Trailing punctuation isn't a letter
+        punctuation = bytes(words.punctuation)
+        self.letter_count = sum(words.lengths) - (len(punctuation) - punctuation.count(0))
+
+        self.word_lengths = dict(Counter(words.lengths))
+        ends = chain(islice(starts, 1, sentence_count), (n,))
+        self.sentence_lengths = dict(Counter(map(sub, ends, starts[:sentence_count])))
+
+        # _factor_prefix[i] = sum of the factors of blocks 0 .. i - 1
+        factors: Sequence[float] = words.pacing_factors
+        self._factors = factors
+        prefix = [0.0]
+        for start in range(0, n, self.BLOCK):
+            prefix.append(prefix[-1] + sum(factors[start:start + self.BLOCK]))
+        self._factor_prefix = prefix
+        self.total_factor = prefix[-1]
+
+    # -----------------------------
+    # Reading Time
+    # -----------------------------
+    def remaining_words(self, index: int) -> int:
+        return max(self.word_count - max(index, 0), 0)
+
+    def remaining_factor(self, index: int) -> float:
+        index = min(max(index, 0), self.word_count)
+        block, offset = divmod(index, self.BLOCK)
+        start = block * self.BLOCK
+        done = self._factor_prefix[block] + sum(self._factors[start:start + offset])
+        return self.total_factor - done
+
+    def reading_seconds(self, wpm: float, index: int = 0, paced: bool = False) -> float:
+        # From word `index` to the end at `wpm`, with or without smart pacing
+        units = self.remaining_factor(index) if paced else self.remaining_words(index)
+        return units * 60 / wpm
+
+    # -----------------------------
+    # Distributions & Readability
+    # -----------------------------
+    @property
+    def words_per_sentence(self) -> float:
+        return self.word_count / max(self.sentence_count, 1)
+
+    @property
+    def letters_per_word(self) -> float:
+        return self.letter_count / max(self.word_count, 1)
+
+    @property
+    def automated_readability_index(self) -> float:
+        # US grade level from letters per word and words per sentence
+        return 4.71 * self.letters_per_word + 0.5 * self.words_per_sentence - 21.43
+
+    @property
+    def coleman_liau_index(self) -> float:
+        letters_per_100 = self.letters_per_word * 100
+        sentences_per_100 = self.sentence_count * 100 / max(self.word_count, 1)
+        return 0.0588 * letters_per_100 - 0.296 * sentences_per_100 - 15.8
+
+    def summary(self, wpm: float, index: int = 0) -> dict:
+        return {
+            "words": self.word_count,
+            "sentences": self.sentence_count,
+            "paragraphs": self.paragraph_count,
+            "chapters": self.chapter_count,
+            "word_length": distribution_summary(self.word_lengths),
+            "sentence_length": distribution_summary(self.sentence_lengths),
+            "automated_readability_index": self.automated_readability_index,
+            "coleman_liau_index": self.coleman_liau_index,
+            "total_minutes": self.reading_seconds(wpm) / 60,
+            "total_minutes_paced": self.reading_seconds(wpm, paced=True) / 60,
+            "remaining_minutes": self.reading_seconds(wpm, index) / 60,
+            "remaining_minutes_paced": self.reading_seconds(wpm, index, paced=True) / 60,
+        }
@@ -0,0 +1,176 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+# -----------------------------
+# Mixer Settings
+# -----------------------------
+FREQUENCY = 44100
+BUFFER_SAMPLES = 512  # affects latency
+NUM_CHANNELS = 16
+
+# Reserved channels (never handed out by pygame's automatic channel search),
+# so a burst of one kind of sound can't cut off another
+CHANNEL_WORD = 0
+CHANNEL_KEYS = 1
+CHANNEL_HOVER = 2
+CHANNEL_CLICKS = 3
+RESERVED_CHANNELS = 4
+
+
+@dataclass
+class Sfx:
+    path: str
+    channel: int
+    volume: float = 1
+    # Events arriving faster than the sample length are dropped instead of
+    # restarting the sample over and over
+    coalesce: bool = False
+    # Set on the audio thread once loaded
+    sound: Any = None
+    length: float = 0.0
+    last_started: float = float("-inf")
+
+
+# -----------------------------
+# Backends
+# -----------------------------
+class NullBackend:
+    # Silent stand-in when there is no audio device (or no pygame), and for
+    # headless runs
+    name = "null"
+    buffer_latency = 0.0
+
+    def load(self, sfx: Sfx) -> None:
+        pass
+
+    def play(self, sfx: Sfx) -> None:
+        pass
+
+
+class PygameBackend:
+    name = "pygame"
+
+    def __init__(self) -> None:
+        # Imported here -> pygame's import cost is paid on the audio thread
+        import pygame.mixer
+
+        self._mixer = pygame.mixer
+        pygame.mixer.init(
+            frequency=FREQUENCY,
+            size=-16,
+            channels=2,
+            buffer=BUFFER_SAMPLES,
+        )
+        pygame.mixer.set_num_channels(NUM_CHANNELS)
+        pygame.mixer.set_reserved(RESERVED_CHANNELS)
+        frequency = pygame.mixer.get_init()[0]
+        self.buffer_latency = BUFFER_SAMPLES / frequency
+        self._channels = [pygame.mixer.Channel(i) for i in range(RESERVED_CHANNELS)]
+
+    def load(self, sfx: Sfx) -> None:
+        sound = self._mixer.Sound(sfx.path)
+        sound.set_volume(sfx.volume)
+        sfx.length = sound.get_length()
+        sfx.sound = sound
+
+    def play(self, sfx: Sfx) -> None:
+        if sfx.sound is not None:
+            self._channels[sfx.channel].play(sfx.sound)
+
+
+# -----------------------------
+# Audio Engine
+# -----------------------------
+class AudioEngine:
+    # All mixer calls happen on one worker thread. The mixer is opened and
+    # the sounds are decoded there too, so the window never waits for audio:
+    # `load` and `play` only queue a request. Requests are handled in order,
+    # so a sound played right after `load` still plays once it's decoded. If
+    # the mixer can't be opened the engine falls back to the silent
+    # NullBackend. Each sound plays on its reserved channel.
+    #
+    # The engine measures its latency: the dispatch delay (request -> the
+    # mixer has the sound) as a moving average and maximum, plus the fixed
+    # output delay of the mixer buffer.
+
+    LATENCY_SMOOTHING = 0.1  # weight of the newest sample in the average
+
+    def __init__(self, backend: NullBackend | PygameBackend | None = None) -> None:
+        # None -> open the mixer on the audio thread
+        self.backend = backend
+        self._backend_ready = threading.Event()
+
+        self.dispatch_latency = 0.0
+        self.max_dispatch_latency = 0.0
+        self.played = 0
+        self.dropped = 0
+
+        self._queue: queue.SimpleQueue[tuple[Sfx, float | None] | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    @property
+    def is_silent(self) -> bool:
+        return isinstance(self.backend, NullBackend)
+
+    @property
+    def latency(self) -> float:
+        # Seconds from `play` to the sound leaving the mixer
+        buffer_latency = self.backend.buffer_latency if self._backend_ready.is_set() else 0.0
+        return self.dispatch_latency + buffer_latency
+
+    def wait_ready(self, timeout: float | None = None) -> bool:
+        return self._backend_ready.wait(timeout)
+
+    def load(self, path: str, channel: int, volume: float = 1, coalesce: bool = False) -> Sfx:
+        sfx = Sfx(path, channel, volume, coalesce)
+        self._queue.put((sfx, None))
+        return sfx
+
+    def play(self, sfx: Sfx) -> None:
+        self._queue.put((sfx, time.perf_counter()))
+
+    def close(self) -> None:
+        self._queue.put(None)
+
+    def _open_backend(self) -> None:
+        if self.backend is None:
+            try:
+                self.backend = PygameBackend()
+            except Exception as ex:  # no pygame, no device, ...
+                print(f"Audio disabled: {ex}")
+                self.backend = NullBackend()
+        self._backend_ready.set()
+
+    def _run(self) -> None:
+        self._open_backend()
+        backend = self.backend
+
+        while True:
+            event = self._queue.get()
+            if event is None:
+                break
+            sfx, requested = event
+
+            if requested is None:
+                try:
+                    backend.load(sfx)
+                except Exception as ex:
+                    print(f"Sound not loaded: {sfx.path}: {ex}")
+                continue
+
+            now = time.perf_counter()
+            if sfx.coalesce and now - sfx.last_started < sfx.length:
+                self.dropped += 1
+                continue
+
+            backend.play(sfx)
+            sfx.last_started = time.perf_counter()
+            self.played += 1
+
+            delay = sfx.last_started - requested
+            self.dispatch_latency += self.LATENCY_SMOOTHING * (delay - self.dispatch_latency)
+            self.max_dispatch_latency = max(self.max_dispatch_latency, delay)
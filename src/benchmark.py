@@ -0,0 +1,409 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import zipfile
+from pathlib import Path
+from types import SimpleNamespace
+
+# Usage (from the repository root):
+#   python src/benchmark.py [--sizes 10000 100000] [--formats txt docx]
+#                           [--output results.json]
+#
+# Generates synthetic .txt / .docx books, then for each of them measures
+# import throughput and peak memory, the book cache, and how accurately the
+# reader hits the requested WPM. The reader is the real app (`main`) driven
+# through a fake Page with silent audio. With --server-sessions, that many
+# readers share one ReaderServer (server mode) and read the first corpus at
+# the same time. Results are written as JSON.
+
+DEFAULT_SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+
+# -----------------------------
+# Synthetic Corpora
+# -----------------------------
+VOCABULARY = (
+    "the of and to a in that it was he for on are as with his they I at be "
+    "this have from or one had by word but not what all were we when your can "
+    "said there use an each which she do how their if will up other about out "
+    "many then them these so some her would make like him into time has look "
+    "two more write go see number no way could people my than first water "
+    "been call who oil its now find long down day did get come made may part "
+    "extraordinarily uncharacteristically reading static flow focus momentum"
+).split()
+PUNCTUATED = ["day.", "time,", "said:", "way;", "again!", "why?", "first,", "water."]
+PARAGRAPH_WORDS = (40, 160)
+CHAPTER_EVERY = 5_000  # words
+
+
+def generate_paragraphs(word_count: int, seed: int = 42):
+    # Paragraphs totalling `word_count` words, with a "Chapter N" heading
+    # every CHAPTER_EVERY words
+    rng = random.Random(seed)
+    vocabulary = VOCABULARY * 4 + PUNCTUATED
+    written = 0
+    chapter = 0
+    next_chapter = 0
+
+    while written < word_count:
+        if written >= next_chapter and word_count - written > 2:
+            chapter += 1
+            next_chapter += CHAPTER_EVERY
+            yield f"Chapter {chapter}"
+            written += 2
+            continue
+
+        n = min(rng.randint(*PARAGRAPH_WORDS), word_count - written)
+        words = rng.choices(vocabulary, k=n)
+        words[-1] = words[-1].rstrip(".,:;!?") + "."
+        yield " ".join(words)
+        written += n
+
+
+def write_txt(path: Path, word_count: int) -> None:
+    with path.open("w", encoding="utf-8") as f:
+        for paragraph in generate_paragraphs(word_count):
+            f.write(paragraph)
+            f.write("\n\n")
+
+
+DOCX_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="word/document.xml"/>'
+    "</Relationships>"
+)
+
+
+def write_docx(path: Path, word_count: int) -> None:
+    # A minimal package, with document.xml streamed into the archive
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml", DOCX_CONTENT_TYPES)
+        archive.writestr("_rels/.rels", DOCX_RELS)
+        with archive.open("word/document.xml", "w", force_zip64=True) as f:
+            f.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+                b"<w:body>"
+            )
+            for paragraph in generate_paragraphs(word_count):
+                f.write(
+                    b'<w:p><w:r><w:t xml:space="preserve">'
+                    + paragraph.encode("utf-8")
+                    + b"</w:t></w:r></w:p>"
+                )
+            f.write(b"</w:body></w:document>")
+
+
+def corpus_path(directory: Path, fmt: str, word_count: int) -> Path:
+    path = directory / f"corpus_{word_count}.{fmt}"
+    if not path.exists():
+        tmp_path = path.with_suffix(".tmp")
+        (write_txt if fmt == "txt" else write_docx)(tmp_path, word_count)
+        os.replace(tmp_path, path)
+    return path
+
+
+# -----------------------------
+# Import
+# -----------------------------
+def open_words(path: Path):
+    # Same sources as the app's import_file (without the book cache)
+    from reader_engine import ReaderEngine
+
+    return ReaderEngine().open_file(path)
+
+
+def benchmark_import(path: Path, cache_dir: Path, wpm: int) -> dict:
+    from analytics import BookStats
+    from book_cache import BookCache
+
+    size = path.stat().st_size
+
+    start = time.perf_counter()
+    words = open_words(path)
+    words.has(0)
+    first_word = time.perf_counter() - start
+    words.load_all()
+    seconds = time.perf_counter() - start
+    word_count = len(words)
+
+    start = time.perf_counter()
+    stats = BookStats(words)
+    analytics_seconds = time.perf_counter() - start
+
+    cache = BookCache(cache_dir, max_bytes=1 << 62)
+    words.book_id = cache.key(path)
+    start = time.perf_counter()
+    cache.store(words)
+    store_seconds = time.perf_counter() - start
+    words.close()
+
+    start = time.perf_counter()
+    cached = cache.load(words.book_id)
+    cached[len(cached) - 1]
+    open_seconds = time.perf_counter() - start
+    cached.close()
+    cache.entry_path(words.book_id).unlink()
+
+    # Separate run -> tracing doesn't skew the timings above
+    tracemalloc.start()
+    words = open_words(path)
+    words.load_all()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    words.close()
+
+    return {
+        "words": word_count,
+        "bytes": size,
+        "seconds": seconds,
+        "mb_per_s": size / seconds / 1e6,
+        "words_per_s": word_count / seconds,
+        "first_word_ms": first_word * 1000,
+        "analytics_ms": analytics_seconds * 1000,
+        "peak_memory_mb": peak / 1e6,
+        "cache_store_s": store_seconds,
+        "cache_open_ms": open_seconds * 1000,
+        "book": stats.summary(wpm),
+    }
+
+
+# -----------------------------
+# Fake Page
+# -----------------------------
+class FakePage:
+    # Just enough of ft.Page for `main`. Updates are recorded instead of
+    # being sent anywhere.
+
+    def __init__(self) -> None:
+        # Created on the event loop, like a real page
+        self.loop = asyncio.get_running_loop()
+        self.controls = []
+        self.overlay = []
+        self.window = SimpleNamespace()
+        self.updates: list[tuple[float, tuple]] = []
+        self.on_keyboard_event = None
+        self.on_disconnect = None
+        self.on_close = None
+
+    def add(self, *controls) -> None:
+        self.controls.extend(controls)
+
+    def update(self, *controls) -> None:
+        self.updates.append((time.perf_counter(), controls))
+
+    def run_task(self, handler, *args):
+        # Callable from any thread, like ft.Page.run_task
+        return asyncio.run_coroutine_threadsafe(handler(*args), self.loop)
+
+    def walk(self):
+        stack = list(self.controls)
+        while stack:
+            control = stack.pop()
+            yield control
+            stack.extend(getattr(control, "controls", None) or ())
+            content = getattr(control, "content", None)
+            if content is not None:
+                stack.append(content)
+
+    def find(self, predicate):
+        return next(control for control in self.walk() if predicate(control))
+
+
+def key_event(key: str, shift: bool = False, ctrl: bool = False):
+    return SimpleNamespace(key=key, shift=shift, ctrl=ctrl, alt=False, meta=False)
+
+
+def percentiles(values: list[float]) -> dict:
+    if len(values) < 2:
+        return {}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {"p50": cuts[49], "p90": cuts[89], "p99": cuts[98], "max": max(values)}
+
+
+async def benchmark_reading(path: Path, wpm: int, word_count: int) -> dict:
+    import flet as ft
+
+    from audio import AudioEngine, NullBackend
+    from StaticReader import main
+
+    page = FakePage()
+    main(page, audio=AudioEngine(NullBackend()))
+
+    txt_the_word = page.find(lambda c: getattr(c, "value", None) == "Import a file to begin")
+    txt_wpm = page.find(lambda c: isinstance(c, ft.TextField) and c.hint_text == "WPM")
+    btn_start = page.find(lambda c: isinstance(c, ft.ElevatedButton) and c.text == "Start")
+    file_picker = next(c for c in page.overlay if isinstance(c, ft.FilePicker))
+
+    # A new book keeps the current settings
+    txt_wpm.value = str(wpm)
+    txt_wpm.on_submit(None)
+
+    file_picker.on_result(SimpleNamespace(files=[SimpleNamespace(path=str(path))]))
+    while not btn_start.visible:
+        await asyncio.sleep(0.01)
+
+    page.updates.clear()
+    page.on_keyboard_event(key_event(" "))
+    # Read until `word_count` words are shown
+    while sum(txt_the_word in controls for _, controls in page.updates) < word_count:
+        await asyncio.sleep(0.05)
+    page.on_keyboard_event(key_event(" "))
+    page.on_disconnect(None)
+
+    shown = [t for t, controls in page.updates if txt_the_word in controls][:word_count]
+    intervals = [b - a for a, b in zip(shown, shown[1:])]
+    expected = 60 / wpm
+    jitter_ms = [abs(interval - expected) * 1000 for interval in intervals]
+
+    return {
+        "requested_wpm": wpm,
+        "achieved_wpm": 60 * len(intervals) / (shown[-1] - shown[0]),
+        "words": len(shown),
+        "jitter_ms": percentiles(jitter_ms),
+    }
+
+
+async def benchmark_server(path: Path, sessions: int, wpm: int, seconds: float) -> dict:
+    import flet as ft
+
+    from server import ReaderServer
+    from StaticReader import main
+
+    started = time.perf_counter()
+    server = ReaderServer([path])
+    server.start()
+
+    pages = [FakePage() for _ in range(sessions)]
+    for page in pages:
+        main(page, server=server)
+    # The word label shows "Loading..." / "Loaded N words" until reading starts
+    words = [
+        page.find(lambda c: isinstance(c, ft.Text) and str(c.value).startswith("Load"))
+        for page in pages
+    ]
+    wpm_fields = [
+        page.find(lambda c: isinstance(c, ft.TextField) and c.hint_text == "WPM")
+        for page in pages
+    ]
+    buttons = [
+        page.find(lambda c: isinstance(c, ft.ElevatedButton) and c.text == "Start")
+        for page in pages
+    ]
+    while not all(button.visible for button in buttons):
+        await asyncio.sleep(0.01)
+    ready_seconds = time.perf_counter() - started
+
+    for page, txt_wpm in zip(pages, wpm_fields):
+        txt_wpm.value = str(wpm)
+        txt_wpm.on_submit(None)
+        page.updates.clear()
+        page.on_keyboard_event(key_event(" "))
+    threads = threading.active_count()
+    await asyncio.sleep(seconds)
+    for page in pages:
+        page.on_keyboard_event(key_event(" "))
+        page.on_disconnect(None)
+    server.close()
+
+    achieved, jitter_ms = [], []
+    expected = 60 / wpm
+    for page, txt_the_word in zip(pages, words):
+        shown = [t for t, controls in page.updates if txt_the_word in controls]
+        intervals = [b - a for a, b in zip(shown, shown[1:])]
+        if intervals:
+            achieved.append(60 * len(intervals) / (shown[-1] - shown[0]))
+        jitter_ms.extend(abs(interval - expected) * 1000 for interval in intervals)
+
+    return {
+        "sessions": sessions,
+        "ready_s": ready_seconds,
+        "threads": threads,
+        "requested_wpm": wpm,
+        "achieved_wpm": percentiles(achieved),
+        "jitter_ms": percentiles(jitter_ms),
+    }
+
+
+# -----------------------------
+# Runner
+# -----------------------------
+def run(args: argparse.Namespace) -> dict:
+    work_dir = Path(tempfile.mkdtemp(prefix="static_reader_bench_"))
+    # Keep the app's cache and sessions out of the user's directories
+    os.environ["XDG_CACHE_HOME"] = str(work_dir / "cache")
+    os.environ["XDG_DATA_HOME"] = str(work_dir / "data")
+
+    corpus_dir = Path(args.corpus_dir) if args.corpus_dir else work_dir / "corpus"
+    corpus_dir.mkdir(parents=True, exist_ok=True)
+
+    results = []
+    for fmt in args.formats:
+        for word_count in args.sizes:
+            path = corpus_path(corpus_dir, fmt, word_count)
+            print(f"{path.name} ...", file=sys.stderr)
+            result = {"format": fmt, "corpus_words": word_count}
+            result["import"] = benchmark_import(path, work_dir / "bench_cache", args.wpm)
+            if args.read_words:
+                result["reading"] = asyncio.run(
+                    benchmark_reading(path, args.wpm, args.read_words)
+                )
+            results.append(result)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    if args.server_sessions and results:
+        first = results[0]
+        path = corpus_path(corpus_dir, first["format"], first["corpus_words"])
+        print(f"server mode, {args.server_sessions} sessions ...", file=sys.stderr)
+        report["server"] = asyncio.run(
+            benchmark_server(path, args.server_sessions, args.wpm, args.server_seconds)
+        )
+    return report
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="StaticReader benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--formats", nargs="+", choices=["txt", "docx"], default=["txt", "docx"])
+    parser.add_argument("--wpm", type=int, default=1000)
+    parser.add_argument(
+        "--read-words", type=int, default=100, help="words read per corpus (0 = skip)"
+    )
+    parser.add_argument(
+        "--server-sessions", type=int, default=0, help="concurrent server-mode readers"
+    )
+    parser.add_argument("--server-seconds", type=float, default=5.0)
+    parser.add_argument("--corpus-dir", help="reuse generated corpora from here")
+    parser.add_argument("--output", help="JSON file (default: stdout)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        Path(args.output).write_text(report + "\n", encoding="utf-8")
+    else:
+        print(report)
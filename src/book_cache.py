@@ -0,0 +1,250 @@
+import hashlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from pathlib import Path
+
+from pacing import PacingModel
+from word_store import LazyWords, decode_words
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "StaticReader" / "books"
+
+
+# -----------------------------
+# Cache Entry Format
+# -----------------------------
+# header | words (UTF-8) | offsets | lengths "H" | punctuation "B"
+#        | word classes "B" | factors "f" | ORP pivots "B" | sentence starts "I"
+#        | paragraph starts "I" | chapter starts "I"
+# Arrays are stored in native byte order and every section starts on an
+# 8-byte boundary, so a loaded entry is used in place without copying.
+MAGIC = b"SRBOOK06"
+# magic, big-endian flag, offsets typecode, word count, buffer bytes,
+# sentence / paragraph / chapter counts, pacing constants the factors were
+# computed with
+HEADER = struct.Struct("<8s?c6xQQQQQdddd")
+ALIGN = 8
+
+
+def _aligned(size: int) -> int:
+    return (size + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _section_sizes(
+    word_count: int, buffer_len: int, offset_itemsize: int, structure_counts: list[int]
+) -> list[int]:
+    return [
+        buffer_len,
+        (word_count + 1) * offset_itemsize,
+        word_count * 2,
+        word_count,
+        word_count,
+        word_count * 4,
+        word_count,
+        *(n * 4 for n in structure_counts),
+    ]
+
+
+class CachedWords(LazyWords):
+    # A fully tokenized book opened from the cache. The word buffer, the
+    # offsets and the pacing tables are memoryviews cast straight over the
+    # mapped entry, so opening it is O(1) no matter how big the book is.
+
+    def __init__(self, path: Path, pacing: PacingModel | None = None) -> None:
+        super().__init__(pacing)
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._views: list[memoryview] = []
+
+        try:
+            fields = HEADER.unpack_from(self._map)
+            magic, big_endian, typecode, count, buffer_len = fields[:5]
+            structure_counts, constants = fields[5:8], fields[8:]
+            if magic != MAGIC or big_endian != (sys.byteorder == "big"):
+                raise ValueError("Incompatible cache entry")
+
+            typecode = typecode.decode("ascii")
+            formats = ["B", typecode, "H", "B", "B", "f", "B", "I", "I", "I"]
+            sizes = _section_sizes(
+                count, buffer_len, struct.calcsize(typecode), structure_counts
+            )
+
+            position = _aligned(HEADER.size)
+            if position + sum(map(_aligned, sizes)) > len(self._map):
+                raise ValueError("Truncated cache entry")
+
+            root = self._view(memoryview(self._map))
+            sections = []
+            for fmt, size in zip(formats, sizes):
+                section = self._view(root[position:position + size])
+                sections.append(self._view(section.cast(fmt)))
+                position += _aligned(size)
+        except Exception:
+            self.close()
+            raise
+
+        (
+            self._buffer,
+            self._offsets,
+            self.lengths,
+            self.punctuation,
+            self.word_classes,
+            self.pacing_factors,
+            self.orp_pivots,
+            self.sentence_starts,
+            self.paragraph_starts,
+            self.chapter_starts,
+        ) = sections
+        self._count = count
+
+        if tuple(constants) != self.pacing.constants:
+            self.set_pacing(self.pacing)
+
+    def _view(self, view: memoryview) -> memoryview:
+        # Views must be released before the map can be closed
+        self._views.append(view)
+        return view
+
+    @property
+    def is_complete(self) -> bool:
+        return True
+
+    def _fill(self, wanted: int) -> None:
+        pass
+
+    def _word(self, index: int) -> str:
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return str(self._buffer[start:end], "utf-8", "ignore")
+
+    def word_range(self, start: int, stop: int) -> list[str]:
+        stop = min(stop, self._count)
+        return decode_words(
+            self._buffer, self._offsets[start:stop], self._offsets[start + 1:stop + 1]
+        )
+
+    def export_words(self) -> tuple[bytes, memoryview]:
+        return self._buffer, self._offsets
+
+    def close(self) -> None:
+        with self._lock:
+            for view in reversed(self._views):
+                view.release()
+            self._views.clear()
+            if not self._map.closed:
+                self._map.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+
+# -----------------------------
+# Book Cache
+# -----------------------------
+class BookCache:
+    # Tokenized books on disk, one file per book, keyed by the file's size,
+    # mtime and a hash of its first and last MiB (hashing whole books would
+    # cost as much as tokenizing them). Loading touches the entry, and the
+    # least recently used entries are evicted once the cache grows past
+    # `max_bytes`.
+
+    MAX_BYTES = 512 << 20
+    SAMPLE_BYTES = 1 << 20
+
+    def __init__(self, directory: Path = CACHE_DIR, max_bytes: int = MAX_BYTES) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    def key(self, file_path: Path) -> str:
+        stat = file_path.stat()
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(struct.pack("<QQ", stat.st_size, stat.st_mtime_ns))
+
+        with file_path.open("rb") as f:
+            digest.update(f.read(self.SAMPLE_BYTES))
+            if stat.st_size > self.SAMPLE_BYTES:
+                f.seek(max(self.SAMPLE_BYTES, stat.st_size - self.SAMPLE_BYTES))
+                digest.update(f.read(self.SAMPLE_BYTES))
+
+        return digest.hexdigest()
+
+    def entry_path(self, key: str) -> Path:
+        return self.directory / f"{key}.book"
+
+    def load(self, key: str, pacing: PacingModel | None = None) -> CachedWords | None:
+        entry = self.entry_path(key)
+        try:
+            words = CachedWords(entry, pacing)
+            os.utime(entry)  # most recently used
+        except (OSError, ValueError, struct.error):
+            return None
+
+        words.book_id = key
+        return words
+
+    def store(self, words: LazyWords) -> None:
+        # Only complete books with a key are cached, and cached books are
+        # never written again
+        if words.book_id is None or not words.is_complete or isinstance(words, CachedWords):
+            return
+
+        buffer, offsets = words.export_words()
+        count = len(offsets) - 1
+        structure = [words.sentence_starts, words.paragraph_starts, words.chapter_starts]
+        sections = [
+            buffer,
+            offsets,
+            words.lengths,
+            words.punctuation,
+            words.word_classes,
+            words.pacing_factors,
+            words.orp_pivots,
+            *structure,
+        ]
+        header = HEADER.pack(
+            MAGIC,
+            sys.byteorder == "big",
+            offsets.typecode.encode("ascii"),
+            count,
+            len(buffer),
+            *map(len, structure),
+            *words.pacing.constants,
+        )
+
+        tmp_path = None
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                dir=self.directory, suffix=".tmp", delete=False
+            ) as f:
+                tmp_path = f.name
+                for data in [header, *sections]:
+                    f.write(data)
+                    f.write(bytes(-f.tell() % ALIGN))
+            # Atomic -> readers never see a half-written entry
+            os.replace(tmp_path, self.entry_path(words.book_id))
+            self._evict(keep=words.book_id)
+        except OSError:
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _evict(self, keep: str) -> None:
+        entries = []
+        for entry in self.directory.glob("*.book"):
+            try:
+                entries.append((entry.stat(), entry))
+            except OSError:
+                continue
+
+        total = sum(stat.st_size for stat, _ in entries)
+        for stat, entry in sorted(entries, key=lambda item: item[0].st_mtime):
+            if total <= self.max_bytes:
+                break
+            if entry.stem == keep:
+                continue
+            try:
+                entry.unlink()
+                total -= stat.st_size
+            except OSError:
+                continue
@@ -0,0 +1,41 @@
+from bisect import bisect_left, bisect_right
+from itertools import chain, compress, repeat
+from typing import Iterable, Sequence
+
+# -----------------------------
+# Chunk Mode (several words per flash)
+# -----------------------------
+MIN_CHUNK_WORDS = 2
+MAX_CHUNK_WORDS = 5
+# Words at least this long are always shown on their own, so a chunk stays
+# short enough to take in at one glance
+LONG_WORD = 12
+
+
+def phrase_breaks(
+    lengths: Sequence[int],
+    punctuation: Sequence[int],
+    paragraph_starts: Sequence[int],
+    start: int,
+    stop: int,
+) -> list[int]:
+    # Sorted indices in [start, stop] a chunk has to start at: after any
+    # punctuation, at a paragraph, and around long words
+    breaks = {start}
+    breaks.update(compress(range(start + 1, stop + 1), punctuation[start:stop]))
+
+    long_words = list(
+        compress(range(start, stop), map(LONG_WORD.__le__, lengths[start:stop]))
+    )
+    breaks.update(long_words)
+    breaks.update(map((1).__add__, long_words))
+
+    first = bisect_left(paragraph_starts, start)
+    last = bisect_right(paragraph_starts, stop)
+    breaks.update(paragraph_starts[first:last])
+    return sorted(breaks)
+
+
+def split_phrases(breaks: Sequence[int], size: int) -> Iterable[int]:
+    # Chunk starts: every phrase breaks[i]:breaks[i + 1] in steps of `size`
+    return chain.from_iterable(map(range, breaks, breaks[1:], repeat(size)))
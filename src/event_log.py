@@ -0,0 +1,187 @@
+import os
+import queue
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, NamedTuple
+
+from sessions import SESSION_DIR
+
+LOG_DIR = SESSION_DIR.parent / "logs"
+
+# -----------------------------
+# Log Format
+# -----------------------------
+# magic | record*, records are appended and never rewritten:
+#   kind "B" | payload length "H" | seconds since the log started "d" | payload
+# A torn last record (crash) is ignored when reading.
+MAGIC = b"SREVLOG1"
+RECORD = struct.Struct("<BHd")
+
+OPEN = 1  # document became current: word count "I", book id, "\0", path
+KEY = 2  # key press: shift "?", ctrl "?", key
+SETTINGS = 3  # wpm "H", smart pacing "?", chunk size "B", ORP "?"
+START = 4  # reading started at word "I"
+STOP = 5  # reading stopped at word "I"
+FRAME = 6  # flash of words [start "I", stop "I") is on screen
+END = 7  # book finished
+
+_INDEX = struct.Struct("<I")
+_FLAGS = struct.Struct("<??")
+_SETTINGS = struct.Struct("<H?B?")
+_FRAME = struct.Struct("<II")
+
+
+class Event(NamedTuple):
+    kind: int
+    time: float
+    fields: tuple
+
+
+def _decode(kind: int, payload: bytes) -> tuple:
+    if kind == OPEN:
+        count = _INDEX.unpack_from(payload)[0]
+        book_id, path = payload[_INDEX.size:].decode("utf-8").split("\0", 1)
+        return count, book_id, path
+    if kind == KEY:
+        return (*_FLAGS.unpack_from(payload), payload[_FLAGS.size:].decode("utf-8"))
+    if kind == SETTINGS:
+        return _SETTINGS.unpack(payload)
+    if kind == FRAME:
+        return _FRAME.unpack(payload)
+    if kind in (START, STOP):
+        return _INDEX.unpack(payload)
+    return ()
+
+
+def read_events(path: str | Path) -> Iterator[Event]:
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"Not an event log: {path}")
+
+    position = len(MAGIC)
+    while position + RECORD.size <= len(data):
+        kind, length, seconds = RECORD.unpack_from(data, position)
+        position += RECORD.size
+        if position + length > len(data):
+            break
+        yield Event(kind, seconds, _decode(kind, data[position:position + length]))
+        position += length
+
+
+# -----------------------------
+# Event Log
+# -----------------------------
+class EventLog:
+    # Append-only binary log of a reading session: inputs, settings and the
+    # time every flash went on screen, for `replay.py`. Recording only packs
+    # a few bytes and queues them; a writer thread appends whatever has
+    # queued up in one write, so the reader loop never waits on the disk.
+    # Settings are only logged when they changed.
+    #
+    # Old logs are deleted when a new one starts, keeping `keep` of them.
+    # A disabled log records nothing.
+
+    KEEP = 20
+
+    def __init__(
+        self,
+        directory: Path = LOG_DIR,
+        clock: Callable[[], float] = time.monotonic,
+        keep: int = KEEP,
+        enabled: bool = True,
+    ) -> None:
+        self.enabled = enabled
+        self.clock = clock
+        self.started_at = clock()
+        self.path = Path(directory) / time.strftime("session-%Y%m%d-%H%M%S.srlog")
+        self._settings: tuple | None = None
+        self._queue: queue.SimpleQueue[bytes | None] = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._run, args=(keep,), daemon=True)
+        if enabled:
+            self._thread.start()
+
+    def _record(self, kind: int, payload: bytes = b"") -> None:
+        if not self.enabled:
+            return
+        self._queue.put(RECORD.pack(kind, len(payload), self.clock() - self.started_at) + payload)
+
+    def open(self, word_count: int, book_id: str | None, path: str | Path | None) -> None:
+        text = f"{book_id or ''}\0{path or ''}".encode("utf-8")
+        self._record(OPEN, _INDEX.pack(word_count) + text)
+
+    def key(self, key: str, shift: bool, ctrl: bool) -> None:
+        self._record(KEY, _FLAGS.pack(shift, ctrl) + key.encode("utf-8"))
+
+    def settings(self, wpm: int, smart_pacing: bool, chunk_size: int, orp: bool) -> None:
+        settings = (wpm, smart_pacing, chunk_size, orp)
+        if settings != self._settings:
+            self._settings = settings
+            self._record(SETTINGS, _SETTINGS.pack(*settings))
+
+    def start(self, index: int) -> None:
+        self._record(START, _INDEX.pack(index))
+
+    def stop(self, index: int) -> None:
+        self._record(STOP, _INDEX.pack(index))
+
+    def frame(self, start: int, stop: int) -> None:
+        self._record(FRAME, _FRAME.pack(start, stop))
+
+    def end(self) -> None:
+        self._record(END)
+
+    def close(self, timeout: float | None = 2) -> None:
+        # Writes what is queued, then stops the writer
+        if self.enabled:
+            self.enabled = False
+            self._queue.put(None)
+            self._thread.join(timeout)
+
+    def _run(self, keep: int) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._delete_old(keep)
+            f = open(self.path, "ab")
+        except OSError as ex:
+            print(f"Event log disabled: {ex}")
+            self._discard()
+            return
+
+        with f:
+            if f.tell() == 0:
+                f.write(MAGIC)
+            while True:
+                records = [self._queue.get()]
+                # Everything queued meanwhile goes out in the same write
+                while records[-1] is not None:
+                    try:
+                        records.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                closing = records[-1] is None
+                try:
+                    f.write(b"".join(filter(None, records)))
+                    f.flush()
+                except OSError as ex:
+                    print(f"Event log stopped: {ex}")
+                    if not closing:
+                        self._discard()
+                    return
+                if closing:
+                    return
+
+    def _discard(self) -> None:
+        # Keeps the queue from growing once nothing can be written
+        while self._queue.get() is not None:
+            pass
+
+    def _delete_old(self, keep: int) -> None:
+        logs = sorted(self.path.parent.glob("session-*.srlog"), key=os.path.getmtime)
+        for log in logs[:max(len(logs) - keep + 1, 0)]:
+            try:
+                log.unlink()
+            except OSError:
+                continue
@@ -0,0 +1,399 @@
+import codecs
+import importlib.util
+import posixpath
+import re
+import zipfile
+from dataclasses import dataclass
+from functools import partial
+from html.parser import HTMLParser
+from itertools import groupby
+from pathlib import Path
+from typing import BinaryIO, Callable, Iterable, Iterator
+from urllib.parse import unquote
+from xml.etree.ElementTree import ParseError, fromstring, iterparse
+
+from structure import Heading
+
+READ_BYTES = 1 << 16  # bytes read per chunk by the streaming importers
+
+
+# -----------------------------
+# Plain Text
+# -----------------------------
+def _decoded_blocks(f: BinaryIO) -> Iterator[str]:
+    # UTF-8 text in READ_BYTES blocks (characters split between blocks are
+    # held back by the incremental decoder)
+    decoder = codecs.getincrementaldecoder("utf-8")("ignore")
+    for block in iter(partial(f.read, READ_BYTES), b""):
+        yield decoder.decode(block)
+    yield decoder.decode(b"", final=True)
+
+
+def read_text_chunks(file_path: Path) -> Iterator[str]:
+    with open(file_path, "rb") as f:
+        yield from _decoded_blocks(f)
+
+
+# -----------------------------
+# .docx
+# -----------------------------
+W_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+W_BODY = W_NS + "body"
+W_P = W_NS + "p"
+W_R = W_NS + "r"
+W_HYPERLINK = W_NS + "hyperlink"
+W_T = W_NS + "t"
+W_BR = W_NS + "br"
+W_TYPE = W_NS + "type"
+
+# Run content that python-docx renders as text, besides w:t
+DOCX_SPECIAL_TEXT = {
+    W_NS + "tab": "\t",
+    W_NS + "ptab": "\t",
+    W_NS + "cr": "\n",
+    W_NS + "noBreakHyphen": "-",
+}
+# Where python-docx looks for that run content, from the body paragraph down
+DOCX_RUN_PATHS = {(W_P, W_R), (W_P, W_HYPERLINK, W_R)}
+
+
+def read_docx_chunks_fast(file_path: Path) -> Iterator[str]:
+    # Streams the body paragraphs straight out of word/document.xml with the
+    # text `Document.paragraphs` has: only top-level paragraphs (not table
+    # cells or content controls), and in them only the runs placed directly
+    # in the paragraph or in a hyperlink (not tracked insertions, fields or
+    # text boxes). Every finished body element is cleared, so memory stays
+    # bounded by the largest paragraph instead of the whole document.
+    with zipfile.ZipFile(file_path) as archive:
+        with archive.open("word/document.xml") as xml:
+            body = None
+            path: list[str] = []  # tags from the body's child down to elem
+            parts: list[str] = []
+
+            for event, elem in iterparse(xml, events=("start", "end")):
+                if event == "start":
+                    if body is not None:
+                        path.append(elem.tag)
+                    elif elem.tag == W_BODY:
+                        body = elem
+                    continue
+                if not path:
+                    continue  # outside the body, or the body itself
+
+                if tuple(path[:-1]) in DOCX_RUN_PATHS:
+                    if elem.tag == W_T:
+                        parts.append(elem.text or "")
+                    elif elem.tag == W_BR:
+                        # Page / column breaks carry no text
+                        if elem.get(W_TYPE, "textWrapping") == "textWrapping":
+                            parts.append("\n")
+                    elif elem.tag in DOCX_SPECIAL_TEXT:
+                        parts.append(DOCX_SPECIAL_TEXT[elem.tag])
+
+                path.pop()
+                if not path:
+                    if elem.tag == W_P:
+                        yield "".join(parts) + "\n\n"
+                    parts.clear()
+                    body.remove(elem)
+
+
+def read_docx_chunks_document(file_path: Path) -> Iterator[str]:
+    from docx import Document
+
+    doc = Document(str(file_path))
+    for p in doc.paragraphs:
+        yield p.text + "\n\n"
+
+
+def read_docx_chunks(file_path: Path) -> Iterator[str]:
+    # Fast path first; fall back to python-docx for documents it can't read
+    # (e.g. a main part that isn't word/document.xml), as long as nothing
+    # was produced yet.
+    produced = False
+    try:
+        for chunk in read_docx_chunks_fast(file_path):
+            produced = True
+            yield chunk
+    except (KeyError, ParseError):
+        if produced:
+            raise
+        yield from read_docx_chunks_document(file_path)
+
+
+# -----------------------------
+# HTML / XHTML
+# -----------------------------
+# Tags that end a paragraph
+HTML_BLOCKS = frozenset(
+    (
+        "address", "article", "aside", "blockquote", "dd", "div", "dl", "dt",
+        "figcaption", "figure", "footer", "header", "hr", "li", "main", "nav",
+        "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+    )
+)
+HTML_HEADINGS = {f"h{level}": level for level in range(1, 7)}
+# Tags whose content is never shown
+HTML_HIDDEN = frozenset(("head", "script", "style", "template", "svg", "math"))
+_WHITESPACE = re.compile(r"\s+")
+
+
+class HtmlText(HTMLParser):
+    # Collects the visible text of an HTML document as it is fed. Blocks
+    # become paragraphs and headings become `Heading` chunks, so the word
+    # sources mark them as chapters.
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self._chunks: list[str] = []
+        self._parts: list[str] = []
+        self._heading: list[str] | None = None  # parts of an open heading
+        self._hidden = 0
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in HTML_HIDDEN:
+            self._hidden += 1
+        elif tag in HTML_HEADINGS:
+            self._end_heading()
+            self._flush()
+            self._heading = []
+        elif tag in HTML_BLOCKS:
+            self._text().append("\n\n")
+        elif tag == "br":
+            self._text().append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in HTML_HIDDEN:
+            self._hidden = max(self._hidden - 1, 0)
+        elif tag in HTML_HEADINGS:
+            self._end_heading()
+        elif tag in HTML_BLOCKS:
+            self._text().append("\n\n")
+
+    def handle_data(self, data: str) -> None:
+        if not self._hidden:
+            # Source line breaks are only whitespace in HTML
+            self._text().append(_WHITESPACE.sub(" ", data))
+
+    def close(self) -> None:
+        super().close()
+        self._end_heading()
+
+    def take(self) -> list[str]:
+        # Chunks finished since the last call (an open heading waits for
+        # its end tag)
+        self._flush()
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+    def _text(self) -> list[str]:
+        return self._parts if self._heading is None else self._heading
+
+    def _flush(self) -> None:
+        if self._parts:
+            self._chunks.append("".join(self._parts))
+            self._parts.clear()
+
+    def _end_heading(self) -> None:
+        if self._heading is not None:
+            self._chunks.append(Heading("".join(self._heading).strip()))
+            self._heading = None
+
+
+def html_chunks(blocks: Iterable[str]) -> Iterator[str]:
+    parser = HtmlText()
+    for block in blocks:
+        parser.feed(block)
+        yield from parser.take()
+    parser.close()
+    yield from parser.take()
+
+
+def read_html_chunks(file_path: Path) -> Iterator[str]:
+    with open(file_path, "rb") as f:
+        yield from html_chunks(_decoded_blocks(f))
+
+
+# -----------------------------
+# EPUB
+# -----------------------------
+EPUB_CONTAINER = "META-INF/container.xml"
+CONTAINER_NS = "{urn:oasis:names:tc:opendocument:xmlns:container}"
+OPF_NS = "{http://www.idpf.org/2007/opf}"
+EPUB_DOCUMENT_TYPES = frozenset(("application/xhtml+xml", "text/html"))
+
+
+def epub_spine(archive: zipfile.ZipFile) -> list[str]:
+    # Archive names of the book's documents in reading order
+    container = fromstring(archive.read(EPUB_CONTAINER))
+    rootfile = container.find(f".//{CONTAINER_NS}rootfile")
+    if rootfile is None:
+        raise ValueError("EPUB has no package document")
+    opf_path = rootfile.get("full-path", "")
+    opf_dir = posixpath.dirname(opf_path)
+
+    package = fromstring(archive.read(opf_path))
+    manifest = {
+        item.get("id"): item
+        for item in package.iterfind(f"{OPF_NS}manifest/{OPF_NS}item")
+    }
+
+    names = []
+    for itemref in package.iterfind(f"{OPF_NS}spine/{OPF_NS}itemref"):
+        item = manifest.get(itemref.get("idref"))
+        if item is None or item.get("media-type") not in EPUB_DOCUMENT_TYPES:
+            continue
+        href = unquote(item.get("href", "").split("#", 1)[0])
+        names.append(posixpath.normpath(posixpath.join(opf_dir, href)))
+    return names
+
+
+def read_epub_chunks(file_path: Path) -> Iterator[str]:
+    # Streams the spine documents one after the other; each one is parsed
+    # incrementally straight out of the archive
+    with zipfile.ZipFile(file_path) as archive:
+        for name in epub_spine(archive):
+            try:
+                document = archive.open(name)
+            except KeyError:  # listed but missing
+                continue
+            with document:
+                yield from html_chunks(_decoded_blocks(document))
+            yield "\n\n"
+
+
+# -----------------------------
+# Markdown
+# -----------------------------
+MD_HEADING = re.compile(r"^\s{0,3}(#{1,6})\s+(.*?)[\s#]*$")
+MD_SETEXT_UNDERLINE = re.compile(r"^\s{0,3}(=+|-+)\s*$")
+MD_RULE = re.compile(r"^\s{0,3}([-*_])(\s*\1){2,}\s*$")
+MD_FENCE = re.compile(r"^\s{0,3}(```|~~~)")
+MD_LINE_MARKER = re.compile(r"^\s*(?:>\s?)*(?:[-*+]\s+|\d+[.)]\s+)?")
+MD_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+MD_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+MD_TAG = re.compile(r"<[^>\n]+>")
+MD_EMPHASIS = re.compile(r"(?<!\w)[*_~`]+|[*_~`]+(?!\w)")
+
+
+def markdown_line_text(line: str) -> str:
+    # A line without its Markdown markup
+    line = MD_LINE_MARKER.sub("", line, count=1)
+    line = MD_IMAGE.sub("", line)
+    line = MD_LINK.sub(r"\1", line)
+    line = MD_TAG.sub("", line)
+    return MD_EMPHASIS.sub("", line)
+
+
+def _joined(parts: list[str]) -> Iterator[str]:
+    # Text parts joined into one chunk, headings as chunks of their own
+    for is_heading, group in groupby(parts, lambda part: type(part) is Heading):
+        if is_heading:
+            yield from group
+        else:
+            yield "".join(group)
+
+
+def markdown_chunks(lines: Iterable[str]) -> Iterator[str]:
+    # Paragraphs stay separated by blank lines; headings become `Heading`
+    # chunks (chapters), rules and fences become paragraph breaks
+    parts: list[str] = []
+    size = 0
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if (
+            parts
+            and type(parts[-1]) is not Heading
+            and not parts[-1].endswith("\n\n")
+            and MD_SETEXT_UNDERLINE.match(line)
+        ):
+            # "Title\n=====" -> the line above was a heading
+            parts[-1] = Heading(parts[-1].strip())
+            continue
+
+        if MD_FENCE.match(line) or MD_RULE.match(line):
+            text = "\n\n"
+        else:
+            heading = MD_HEADING.match(line)
+            if heading:
+                text = Heading(markdown_line_text(heading.group(2)))
+            else:
+                text = markdown_line_text(line) + "\n" if line.strip() else "\n\n"
+
+        parts.append(text)
+        size += len(text)
+        if size >= READ_BYTES:
+            # The last line may still turn out to be a setext heading
+            last = parts.pop()
+            yield from _joined(parts)
+            parts = [last]
+            size = len(last)
+    yield from _joined(parts)
+
+
+def read_markdown_chunks(file_path: Path) -> Iterator[str]:
+    with open(file_path, encoding="utf-8", errors="ignore") as f:
+        yield from markdown_chunks(f)
+
+
+# -----------------------------
+# PDF (text layer)
+# -----------------------------
+# Words hyphenated across a line break
+PDF_HYPHENATION = re.compile(r"(\w)-\n\s*(\w)")
+
+
+def read_pdf_chunks(file_path: Path) -> Iterator[str]:
+    # One chunk per page of the PDF's text layer (scanned pages have none)
+    from pypdf import PdfReader
+
+    reader = PdfReader(str(file_path))
+    for page in reader.pages:
+        text = page.extract_text() or ""
+        yield PDF_HYPHENATION.sub(r"\1\2", text) + "\n"
+
+
+# -----------------------------
+# Importer Registry
+# -----------------------------
+@dataclass(frozen=True)
+class Importer:
+    name: str
+    suffixes: tuple[str, ...]
+    # Streams the document's text; paragraphs are separated by blank lines
+    read_chunks: Callable[[Path], Iterator[str]]
+    # Plain UTF-8 text -> the word source can memory-map the file instead
+    mappable: bool = False
+
+
+IMPORTERS: dict[str, Importer] = {}
+
+
+def register_importer(importer: Importer) -> Importer:
+    # Later registrations win for a suffix
+    for suffix in importer.suffixes:
+        IMPORTERS[suffix.lower()] = importer
+    return importer
+
+
+def importer_for(file_path: Path) -> Importer:
+    suffix = Path(file_path).suffix.lower()
+    importer = IMPORTERS.get(suffix)
+    if importer is None:
+        raise ValueError(f"Unsupported file type: {suffix}")
+    return importer
+
+
+def supported_extensions() -> list[str]:
+    # For file pickers (no leading dot)
+    return [suffix.lstrip(".") for suffix in IMPORTERS]
+
+
+register_importer(Importer("Text", (".txt",), read_text_chunks, mappable=True))
+register_importer(Importer("Word", (".docx",), read_docx_chunks))
+register_importer(Importer("EPUB", (".epub",), read_epub_chunks))
+register_importer(Importer("Markdown", (".md", ".markdown"), read_markdown_chunks))
+register_importer(Importer("HTML", (".html", ".htm", ".xhtml"), read_html_chunks))
+# Optional dependency -> PDFs are only offered when they can be read
+if importlib.util.find_spec("pypdf") is not None:
+    register_importer(Importer("PDF", (".pdf",), read_pdf_chunks))
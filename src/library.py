@@ -0,0 +1,192 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+from probes import probes
+from word_store import LazyWords
+
+
+@dataclass(eq=False)
+class LibraryBook:
+    path: Path
+    words: LazyWords | None = None
+    pinned: int = 0  # handed out by `take` and not released yet
+    loading: bool = False  # a prefetch job is tokenizing it
+    evicted: bool = False
+    future: Future | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock)  # guards opening
+
+
+# -----------------------------
+# Library (document queue)
+# -----------------------------
+class Library:
+    # An ordered list of documents that are read one after the other. While
+    # one is read, the next `prefetch` documents are opened and tokenized by
+    # a small worker pool, so moving on needs no load pause.
+    #
+    # Open word sources are kept in an LRU of at most `max_open` books; the
+    # least recently used one that isn't in use (or about to be) is closed.
+    # Fully tokenized prefetched books go to `on_loaded` (the book cache), so
+    # an evicted book reopens in O(1).
+    #
+    # The library owns every source it opens: users `take` one and
+    # `release` it when they move on instead of closing it. A `pool` passed
+    # in (shared by several libraries) isn't shut down by `close`.
+
+    MAX_OPEN = 4
+    PREFETCH = 2
+    WORKERS = 2
+
+    def __init__(
+        self,
+        open_source: Callable[[Path], LazyWords],
+        on_loaded: Callable[[LazyWords], None] | None = None,
+        max_open: int = MAX_OPEN,
+        prefetch: int = PREFETCH,
+        workers: int = WORKERS,
+        pool: ThreadPoolExecutor | None = None,
+    ) -> None:
+        self.paths: list[Path] = []
+        self.position = -1  # index of the document last taken
+        self.max_open = max_open
+        self.prefetch = prefetch
+        self._open_source = open_source
+        self._on_loaded = on_loaded
+        self._books: OrderedDict[Path, LibraryBook] = OrderedDict()
+        self._lock = threading.Lock()
+        self._owns_pool = pool is None
+        self._pool = pool or ThreadPoolExecutor(workers, thread_name_prefix="prefetch")
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    @property
+    def current(self) -> Path | None:
+        if 0 <= self.position < len(self.paths):
+            return self.paths[self.position]
+        return None
+
+    def set_paths(self, paths: list[str | Path]) -> None:
+        # Replaces the queue; open books stay cached until evicted
+        with self._lock:
+            self.paths = [Path(p) for p in paths]
+            self.position = -1
+        self._schedule_prefetch(0)
+
+    def next_index(self, backwards: bool = False) -> int | None:
+        index = self.position + (-1 if backwards else 1)
+        return index if 0 <= index < len(self.paths) else None
+
+    def is_ready(self, index: int) -> bool:
+        # Opened with its first word tokenized -> `take` returns at once
+        with self._lock:
+            book = self._books.get(self.paths[index])
+        return book is not None and book.words is not None and len(book.words) > 0
+
+    def take(self, index: int) -> LazyWords:
+        # The word source of document `index`, opened now unless it was
+        # prefetched. It stays open until it is released.
+        with self._lock:
+            self.position = index
+            book = self._book(self.paths[index])
+            book.pinned += 1
+
+        try:
+            words = self._open(book)
+        except Exception:
+            with self._lock:
+                book.pinned -= 1
+            raise
+
+        self._schedule_prefetch(index + 1)
+        return words
+
+    def release(self, words: LazyWords) -> None:
+        with self._lock:
+            for book in self._books.values():
+                if book.words is words and book.pinned:
+                    book.pinned -= 1
+                    break
+            else:
+                # Not (or no longer) in the library
+                words.close()
+            self._evict()
+
+    def close(self) -> None:
+        if self._owns_pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            for book in self._books.values():
+                book.evicted = True
+                if not book.loading and book.words is not None:
+                    book.words.close()
+            self._books.clear()
+
+    def _book(self, path: Path) -> LibraryBook:
+        # Under `_lock`; also marks the book as most recently used
+        book = self._books.get(path)
+        if book is None:
+            book = self._books[path] = LibraryBook(path)
+        self._books.move_to_end(path)
+        return book
+
+    def _open(self, book: LibraryBook) -> LazyWords:
+        # Whoever comes first opens it; the other one waits
+        with book.lock:
+            if book.words is None:
+                words = self._open_source(book.path)
+                words.has(0)
+                book.words = words
+        return book.words
+
+    def _schedule_prefetch(self, start: int) -> None:
+        with self._lock:
+            for index in range(start, min(start + self.prefetch, len(self.paths))):
+                book = self._book(self.paths[index])
+                if book.future is None:
+                    book.loading = True
+                    book.future = self._pool.submit(self._prefetch, book)
+            # The queue order wins over recency for the books just scheduled
+            self._evict()
+
+    def _prefetch(self, book: LibraryBook) -> None:
+        try:
+            if book.evicted:
+                return
+            started = probes.start()
+            words = self._open(book)
+            while not book.evicted and not words.is_complete:
+                words.load_step()
+            probes.stop("library.prefetch", started)
+            if not book.evicted and self._on_loaded is not None:
+                self._on_loaded(words)
+        except Exception as ex:
+            # Reported when the document is taken (it's opened again then)
+            print(f"Prefetch failed: {book.path}: {ex}")
+            with book.lock:
+                book.words = None
+        finally:
+            with self._lock:
+                book.loading = False
+                if book.evicted and book.words is not None:
+                    book.words.close()
+
+    def _evict(self) -> None:
+        # Under `_lock`. Books in use and the ones queued next are kept.
+        upcoming = set(self.paths[self.position + 1:self.position + 1 + self.prefetch])
+        excess = len(self._books) - self.max_open
+        for path, book in list(self._books.items()):
+            if excess <= 0:
+                break
+            if book.pinned or path in upcoming:
+                continue
+            del self._books[path]
+            book.evicted = True
+            excess -= 1
+            # A running prefetch job closes it when it stops
+            if not book.loading and book.words is not None:
+                book.words.close()
@@ -0,0 +1,18 @@
+from array import array
+from itertools import repeat
+from operator import sub
+from typing import Iterable
+
+# -----------------------------
+# Optimal Recognition Point
+# -----------------------------
+# Index of the letter the eye fixates on, by word length (not counting
+# trailing punctuation): a little left of the middle
+ORP_PIVOTS = bytes((0, 0, 1, 1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 3, 4))
+
+
+def orp_pivots(lengths: Iterable[int], punctuation: Iterable[int]) -> array:
+    # Bulk pivot lookup for words with the given lengths / punctuation classes
+    letters = map(sub, lengths, map(bool, punctuation))
+    last = len(ORP_PIVOTS) - 1
+    return array("B", map(ORP_PIVOTS.__getitem__, map(min, letters, repeat(last))))
@@ -0,0 +1,114 @@
+from array import array
+from itertools import repeat
+from operator import add, itemgetter, mul
+from typing import Iterable
+
+from word_frequency import (
+    WORD_CLASS_COUNT,
+    WORD_COMMON,
+    WORD_FREQUENT,
+    WORD_KNOWN,
+    WORD_NAME,
+    WORD_NUMBER,
+    WORD_RARE,
+)
+
+
+# -----------------------------
+# Punctuation Classes
+# -----------------------------
+PUNCT_NONE = 0
+PUNCT_PAUSE = 1  # , ; : " ' ) ] }
+PUNCT_STOP = 2  # . ! ?
+
+PUNCTUATION_CLASSES = {
+    **{c: PUNCT_PAUSE for c in (",", ";", ":", '"', "'", ")", "]", "}")},
+    **{c: PUNCT_STOP for c in (".", "!", "?")},
+}
+# bytes.translate() table: last byte of a word -> its punctuation class
+PUNCTUATION_BYTE_TABLE = bytes(
+    PUNCTUATION_CLASSES.get(chr(b), PUNCT_NONE) for b in range(256)
+)
+PUNCTUATION_FACTORS = (1.0, 1.225, 1.375)
+
+MAX_TRACKED_LENGTH = 0xFFFF  # word lengths are stored as array("H")
+
+
+def punctuation_class(word: str) -> int:
+    return PUNCTUATION_CLASSES.get(word[-1], PUNCT_NONE) if word else PUNCT_NONE
+
+
+def punctuation_classes(words: list[str]) -> Iterable[int]:
+    # Bulk version of `punctuation_class` for non-empty tokens
+    return map(PUNCTUATION_CLASSES.get, map(itemgetter(-1), words), repeat(PUNCT_NONE))
+
+
+# -----------------------------
+# Smart Pacing Model
+# -----------------------------
+# Relative delay change per word class (scaled by `rarity_weight`): common
+# words go faster, rare words, names and numbers slower
+RARITY_OFFSETS = {
+    WORD_COMMON: -0.5,
+    WORD_FREQUENT: -0.2,
+    WORD_KNOWN: 0.0,
+    WORD_RARE: 0.5,
+    WORD_NAME: 0.3,
+    WORD_NUMBER: 0.8,
+}
+
+
+class PacingModel:
+    # The smart-pacing factor of a word only depends on its length, its
+    # punctuation class and its word class (frequency band, name, number),
+    # so factors are computed once per (length, punctuation, class) triple
+    # into a flat table and words are mapped through it in bulk. WPM is not
+    # part of the factor: the delay is `base_delay * factor`, so WPM changes
+    # never need a recompute.
+
+    def __init__(
+        self,
+        avg_word_len: float = 4.5,
+        length_weight: float = 0.3,
+        min_factor: float = 0.7,
+        rarity_weight: float = 0.3,
+    ) -> None:
+        self.avg_word_len = avg_word_len
+        self.length_weight = length_weight
+        self.min_factor = min_factor
+        self.rarity_weight = rarity_weight
+        # _table[(length * len(PUNCTUATION_FACTORS) + punctuation)
+        #        * WORD_CLASS_COUNT + word_class]
+        self._table: list[float] = []
+
+    @property
+    def constants(self) -> tuple[float, float, float, float]:
+        return self.avg_word_len, self.length_weight, self.min_factor, self.rarity_weight
+
+    def factor(self, length: int, punctuation: int, word_class: int = WORD_KNOWN) -> float:
+        length_factor = (
+            1.0 + ((length - self.avg_word_len) / self.avg_word_len) * self.length_weight
+        )
+        length_factor = max(self.min_factor, length_factor)
+        rarity_factor = 1.0 + RARITY_OFFSETS[word_class] * self.rarity_weight
+
+        return length_factor * rarity_factor * PUNCTUATION_FACTORS[punctuation]
+
+    def _grow_table(self, max_length: int) -> None:
+        row = len(PUNCTUATION_FACTORS) * WORD_CLASS_COUNT
+        for length in range(len(self._table) // row, max_length + 1):
+            self._table.extend(
+                self.factor(length, p, c)
+                for p in range(len(PUNCTUATION_FACTORS))
+                for c in range(WORD_CLASS_COUNT)
+            )
+
+    def factors(self, lengths: array, punctuation: array, word_classes: array) -> array:
+        if not lengths:
+            return array("f")
+        self._grow_table(max(lengths))
+
+        width = len(PUNCTUATION_FACTORS)
+        keys = map(add, map(mul, lengths, repeat(width)), punctuation)
+        keys = map(add, map(mul, keys, repeat(WORD_CLASS_COUNT)), word_classes)
+        return array("f", map(self._table.__getitem__, keys))
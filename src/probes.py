@@ -0,0 +1,160 @@
+import functools
+import json
+import threading
+import time
+from array import array
+from collections import deque
+from pathlib import Path
+from typing import Callable
+
+
+# -----------------------------
+# Ring-Buffer Histogram
+# -----------------------------
+class Histogram:
+    # Keeps the last `capacity` samples (seconds) in a preallocated ring, so
+    # recording is O(1) with no allocation, and memory stays fixed however
+    # long the app runs. Percentiles are computed from the ring on demand.
+
+    __slots__ = ("_samples", "_next", "count", "total")
+
+    def __init__(self, capacity: int) -> None:
+        self._samples = array("d", bytes(8 * capacity))
+        self._next = 0
+        self.count = 0  # all samples ever recorded
+        self.total = 0.0
+
+    def record(self, value: float) -> None:
+        samples = self._samples
+        samples[self._next] = value
+        self._next = (self._next + 1) % len(samples)
+        self.count += 1
+        self.total += value
+
+    def samples(self) -> list[float]:
+        return sorted(self._samples[: min(self.count, len(self._samples))])
+
+    def summary(self) -> dict[str, float]:
+        # Milliseconds, over the samples still in the ring
+        samples = self.samples()
+        if not samples:
+            return {"count": self.count}
+
+        def percentile(p: float) -> float:
+            return samples[min(int(p * len(samples)), len(samples) - 1)] * 1000
+
+        return {
+            "count": self.count,
+            "mean": self.total / self.count * 1000,
+            "p50": percentile(0.5),
+            "p90": percentile(0.9),
+            "p99": percentile(0.99),
+            "max": samples[-1] * 1000,
+        }
+
+
+# -----------------------------
+# Probes
+# -----------------------------
+class Probes:
+    # Named timing probes:
+    #
+    #   started = probes.start()
+    #   ...
+    #   probes.stop("reader.flush", started)
+    #
+    # or `@probes.timed("input.keyboard")` on a function. Every probe feeds
+    # its own histogram, and the last `trace_capacity` spans are kept for
+    # `export_trace` (Chrome trace format -> chrome://tracing, Perfetto).
+
+    HISTOGRAM_CAPACITY = 1024
+    TRACE_CAPACITY = 1 << 16
+
+    def __init__(
+        self,
+        clock: Callable[[], float] = time.perf_counter,
+        histogram_capacity: int = HISTOGRAM_CAPACITY,
+        trace_capacity: int = TRACE_CAPACITY,
+    ) -> None:
+        self.clock = clock
+        self.enabled = True
+        self.histograms: dict[str, Histogram] = {}
+        self._histogram_capacity = histogram_capacity
+        # (name, start, duration, thread id); deque appends are thread-safe
+        self._trace: deque[tuple[str, float, float, int]] = deque(maxlen=trace_capacity)
+        self._epoch = clock()
+
+    def _histogram(self, name: str) -> Histogram:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms.setdefault(name, Histogram(self._histogram_capacity))
+        return histogram
+
+    def start(self) -> float:
+        return self.clock()
+
+    def stop(self, name: str, started: float) -> None:
+        if not self.enabled:
+            return
+        duration = self.clock() - started
+        self._histogram(name).record(duration)
+        self._trace.append((name, started, duration, threading.get_ident()))
+
+    def record(self, name: str, value: float) -> None:
+        # A measured value (e.g. a lag) instead of a timed span
+        if self.enabled:
+            self._histogram(name).record(value)
+
+    def timed(self, name: str) -> Callable:
+        def decorator(function: Callable) -> Callable:
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                started = self.clock()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.stop(name, started)
+
+            return wrapper
+
+        return decorator
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        return {name: h.summary() for name, h in sorted(self.histograms.items())}
+
+    def format_summary(self) -> str:
+        lines = []
+        for name, stats in self.summary().items():
+            if "p50" not in stats:
+                continue
+            lines.append(
+                f"{name:<18} p50 {stats['p50']:7.2f}  p99 {stats['p99']:7.2f}"
+                f"  max {stats['max']:7.2f} ms  n={stats['count']}"
+            )
+        return "\n".join(lines)
+
+    def export_trace(self, path: Path) -> int:
+        # Returns the number of spans written
+        spans = list(self._trace)
+        events = [
+            {
+                "name": name,
+                "cat": name.split(".", 1)[0],
+                "ph": "X",
+                "ts": (start - self._epoch) * 1e6,
+                "dur": duration * 1e6,
+                "pid": 0,
+                "tid": thread_id,
+            }
+            for name, start, duration, thread_id in spans
+        ]
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(
+            json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}), encoding="utf-8"
+        )
+        return len(events)
+
+
+# Shared by the app and the word sources' loader threads
+probes = Probes()
@@ -0,0 +1,326 @@
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator
+
+from analytics import BookStats
+from book_cache import BookCache
+from chunking import MAX_CHUNK_WORDS, MIN_CHUNK_WORDS
+from importers import importer_for
+from pacing import PacingModel
+from scheduler import DeadlineScheduler
+from sessions import ReadingSession
+from structure import next_boundary, previous_boundary
+from word_store import LazyWords, MappedWords, StreamingWords
+
+# -----------------------------
+# Reading Speed [WPM]
+# -----------------------------
+DEFAULT_WPM = 60
+LOWER_LIMIT = 1
+UPPER_LIMIT = 1000
+CHUNK_UPPER_LIMIT = 3000  # several words per flash -> far fewer updates
+
+# -----------------------------
+# Smart Pacing
+# -----------------------------
+AVG_WORD_LEN = 4.5
+LENGTH_WEIGHT = 0.3
+MIN_FACTOR = 0.7
+RARITY_WEIGHT = 0.3  # common words faster, rare words / names / numbers slower
+
+# Structural jumps
+SENTENCE = "sentence"
+PARAGRAPH = "paragraph"
+CHAPTER = "chapter"
+
+
+# -----------------------------
+# Reader Engine
+# -----------------------------
+class ReaderEngine:
+    # Everything about reading a book that doesn't need a UI: the word
+    # source, the cursor, speed and pacing, and the deadline scheduler. The
+    # Flet app is a view over one engine; benchmarks and tools drive it
+    # directly. Engines share nothing but the (optional) book cache, and
+    # `__slots__` keeps each one small, so many can live in one process.
+
+    __slots__ = (
+        "words",
+        "word_index",
+        "is_active",
+        "is_reading_complete",
+        "wpm",
+        "lower_limit",
+        "upper_limit",
+        "base_delay",
+        "use_smart_pacing",
+        "use_orp",
+        "chunk_size",
+        "pacing",
+        "scheduler",
+        "book_cache",
+        "stats",
+    )
+
+    def __init__(
+        self,
+        book_cache: BookCache | None = None,
+        pacing: PacingModel | None = None,
+        scheduler: DeadlineScheduler | None = None,
+    ) -> None:
+        self.words: LazyWords = StreamingWords(())
+        self.word_index = 0
+        self.is_active = False
+        self.is_reading_complete = False
+
+        self.wpm = DEFAULT_WPM
+        self.lower_limit = LOWER_LIMIT
+        self.upper_limit = UPPER_LIMIT
+        self.base_delay = 60 / self.wpm
+
+        self.use_smart_pacing = False
+        self.use_orp = False  # single words aligned on their ORP pivot
+        self.chunk_size = 0  # words per flash, 0 = one word
+        # Per-word factors are precomputed by the word source at load time
+        self.pacing = pacing or PacingModel(
+            AVG_WORD_LEN, LENGTH_WEIGHT, MIN_FACTOR, RARITY_WEIGHT
+        )
+        self.scheduler = scheduler or DeadlineScheduler()
+        self.book_cache = book_cache
+        self.stats: BookStats | None = None  # once the book is fully loaded
+
+    # -----------------------------
+    # Books
+    # -----------------------------
+    def open_file(self, path: str | Path) -> LazyWords:
+        # A word source for the file (from the book cache if it's there). It
+        # isn't read yet and doesn't become the current book: pass it to
+        # `load` once it has its first word.
+        file_path = Path(path)
+        importer = importer_for(file_path)
+
+        book_id = None
+        if self.book_cache is not None:
+            book_id = self.book_cache.key(file_path)
+            cached = self.book_cache.load(book_id, self.pacing)
+            if cached is not None:
+                return cached
+
+        if importer.mappable:
+            # Memory-mapped -> only the shown word is ever decoded
+            words = MappedWords(file_path, self.pacing)
+        else:
+            words = StreamingWords(importer.read_chunks(file_path), self.pacing)
+
+        words.book_id = book_id
+        return words
+
+    def load(self, words: LazyWords) -> None:
+        self.words = words
+        self.stats = None
+        words.set_chunk_size(self.chunk_size)
+        self.word_index = 0
+        self.is_reading_complete = False
+
+    def detach(self) -> LazyWords:
+        # Hands the current book to the caller and leaves the engine empty
+        self.is_active = False
+        words = self.words
+        self.load(StreamingWords(()))
+        return words
+
+    def close(self) -> None:
+        self.detach().close()
+
+    @property
+    def book_id(self) -> str | None:
+        return self.words.book_id
+
+    # -----------------------------
+    # Speed & Pacing
+    # -----------------------------
+    def set_wpm(self, wpm: int) -> int:
+        # Clamped to the limits; returns the speed actually set
+        self.wpm = min(max(wpm, self.lower_limit), self.upper_limit)
+        self.base_delay = 60 / self.wpm
+        return self.wpm
+
+    def adjust_wpm(self, step: int) -> int:
+        return self.set_wpm(self.wpm + step)
+
+    def set_chunk_size(self, size: int) -> int:
+        # 0 -> one word per flash; returns the size actually set
+        if size:
+            size = min(max(size, MIN_CHUNK_WORDS), MAX_CHUNK_WORDS)
+        self.chunk_size = size
+        self.upper_limit = CHUNK_UPPER_LIMIT if size else UPPER_LIMIT
+        self.set_wpm(self.wpm)
+        self.words.set_chunk_size(size)
+        return size
+
+    def frame_delay(self, start: int, stop: int) -> float:
+        # How long words [start, stop) stay on screen
+        if self.use_smart_pacing:
+            # Length, word frequency + punctuation pauses, precomputed per word
+            if stop - start == 1:
+                return self.base_delay * self.words.pacing_factors[start]
+            return self.base_delay * sum(self.words.pacing_factors[start:stop])
+        return self.base_delay * (stop - start)
+
+    def analyze(self, stats: BookStats | None = None) -> BookStats | None:
+        # One pass over the fully loaded book; estimates are cheap afterwards.
+        # `stats` of the same book computed elsewhere (server mode) are used
+        # as they are.
+        words = self.words
+        if not words.is_complete:
+            return None
+        if stats is None:
+            stats = BookStats(words)
+        if words is self.words:  # not switched meanwhile
+            self.stats = stats
+        return stats
+
+    # -----------------------------
+    # Cursor
+    # -----------------------------
+    @property
+    def current_word(self) -> str | None:
+        if not self.words.has(self.word_index):
+            return None
+        return self.words[self.word_index]
+
+    def jump_to(self, index: int) -> bool:
+        if not self.words.has(index):
+            return False
+        self.word_index = index
+        return True
+
+    def move(self, step: int) -> None:
+        # Relative move; moving past the end parks the cursor after the
+        # last word
+        new_index = self.word_index
+        if step < 0:
+            if self.word_index > 0:
+                new_index += step
+        elif self.words.has(self.word_index + 1):
+            new_index += step
+
+        if new_index < 0:
+            new_index = 0
+        elif not self.words.has(new_index):
+            new_index = len(self.words)
+        self.word_index = new_index
+
+    def frame_end(self, index: int) -> int:
+        # End of the flash starting at `index`: the next word, or the next
+        # chunk start
+        if not self.chunk_size:
+            return index + 1
+        end = self.words.chunk_end(index)
+        if end is None:
+            # The last phrase loaded so far isn't chunked yet
+            end = index + self.chunk_size
+        return min(end, len(self.words))
+
+    def frame_text(self, start: int, stop: int) -> str:
+        if stop - start == 1:
+            return self.words[start]
+        return " ".join(self.words.word_range(start, stop))
+
+    def orp_parts(self, index: int) -> tuple[str, str, str]:
+        # (before, pivot letter, after), split at the precomputed pivot
+        word = self.words[index]
+        pivot = self.words.orp_pivots[index]
+        return word[:pivot], word[pivot:pivot + 1], word[pivot + 1:]
+
+    def boundary(self, kind: str, backwards: bool) -> int | None:
+        # First word of the previous / next sentence, paragraph or chapter
+        words = self.words
+        starts = {
+            SENTENCE: words.sentence_starts,
+            PARAGRAPH: words.paragraph_starts,
+            CHAPTER: words.chapter_starts,
+        }[kind]
+
+        if backwards:
+            return previous_boundary(starts, self.word_index)
+
+        # The next boundary may not be tokenized yet
+        target = next_boundary(starts, self.word_index)
+        while target is None and not words.is_complete:
+            words.load_step()
+            target = next_boundary(starts, self.word_index)
+        return target
+
+    def context(self, count: int) -> list[str]:
+        # Up to `count` words starting at the cursor
+        words = []
+        while len(words) < count and self.words.has(self.word_index + len(words)):
+            words.append(self.words[self.word_index + len(words)])
+        return words
+
+    # -----------------------------
+    # Sessions
+    # -----------------------------
+    def save_to(self, session: ReadingSession) -> None:
+        session.word_index = self.word_index
+        session.wpm = self.wpm
+        session.use_smart_pacing = self.use_smart_pacing
+        session.chunk_size = self.chunk_size
+        session.use_orp = self.use_orp
+
+    def restore_from(self, session: ReadingSession) -> None:
+        # Chunk size first -> it sets the speed limit
+        self.set_chunk_size(session.chunk_size)
+        self.set_wpm(session.wpm)
+        self.use_smart_pacing = session.use_smart_pacing
+        self.use_orp = session.use_orp
+        # O(1) for cached books, otherwise tokenizes up to the saved position
+        if session.word_index > 0 and self.words.has(session.word_index):
+            self.word_index = session.word_index
+
+    # -----------------------------
+    # Reading
+    # -----------------------------
+    def start(self) -> bool:
+        if not self.words or self.is_active:
+            return False
+        self.is_active = True
+        return True
+
+    def stop(self) -> None:
+        self.is_active = False
+
+    def reset(self) -> None:
+        self.is_active = False
+        self.is_reading_complete = False
+        self.word_index = 0
+
+    def complete(self) -> None:
+        self.is_active = False
+        self.is_reading_complete = True
+        self.word_index = 0
+
+    async def frames(self) -> AsyncIterator[tuple[int, int]]:
+        # Yields the word range [start, stop) of each flash (one word, or a
+        # chunk) when it is due on screen, until the reader is stopped or the
+        # book ends (then `is_active` is still set). The consumer renders each
+        # flash before asking for the next one.
+        scheduler = self.scheduler
+        scheduler.start()
+
+        while self.is_active:
+            start = self.word_index
+            stop = self.frame_end(start)
+            yield start, stop
+
+            delay = self.frame_delay(start, stop)
+            self.word_index = stop
+
+            # Sleep until this flash's absolute deadline, not for a fixed
+            # delay after rendering it
+            await asyncio.sleep(scheduler.schedule(delay, stop - start))
+
+            if not self.words.has(self.word_index):
+                # Still active -> the caller can tell the end from a stop
+                return
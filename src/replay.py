@@ -0,0 +1,265 @@
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from operator import itemgetter
+from pathlib import Path
+
+from book_cache import BookCache
+from event_log import END, FRAME, KEY, LOG_DIR, OPEN, SETTINGS, START, STOP, Event, read_events
+from reader_engine import ReaderEngine
+from scheduler import DeadlineScheduler
+
+# Usage (from the repository root):
+#   python src/replay.py [LOG] [--live] [--late-ms 20] [--output report.json]
+#
+# Replays an event log written by the app (the newest one by default). Each
+# reading run in it (start -> stop / end) is re-driven through a headless
+# ReaderEngine: the logged document is opened again, the logged settings
+# are applied when they were changed, and every logged flash is booked on a
+# DeadlineScheduler running on the logged clock. So the deadlines are the
+# ones the app had, and the report shows how late each flash really was,
+# how often the scheduler resynced and whether the flashes still match what
+# the engine produces for that book and those settings. Key presses while
+# reading are listed with the run, and each of the worst flashes lists the
+# keys pressed since the flash before it, so a stall can be traced back to
+# the input that caused it.
+#
+# With --live every run is read again in real time on this machine (no UI),
+# so the same numbers can be compared against a clean reading loop.
+
+LATE_MS = 20.0  # a flash this much past its deadline counts as late
+WORST_FRAMES = 5
+
+
+@dataclass
+class Run:
+    path: str | None
+    book_id: str | None
+    settings: tuple  # wpm, smart pacing, chunk size, ORP at the start
+    started: float
+    frames: list[Event] = field(default_factory=list)
+    changes: list[Event] = field(default_factory=list)  # settings while reading
+    keys: list[Event] = field(default_factory=list)  # key presses while reading
+    ended: bool = False  # reached the end of the book
+
+
+def reading_runs(events: list[Event]) -> list[Run]:
+    runs: list[Run] = []
+    run = None
+    document = (None, None)
+    settings = None
+    for event in events:
+        if event.kind == OPEN:
+            run = None
+            document = (event.fields[2] or None, event.fields[1] or None)
+        elif event.kind == SETTINGS:
+            settings = event.fields
+            if run is not None:
+                run.changes.append(event)
+        elif event.kind == START and settings is not None:
+            run = Run(*document, settings, event.time)
+            runs.append(run)
+        elif event.kind == FRAME and run is not None:
+            run.frames.append(event)
+        elif event.kind == KEY and run is not None:
+            run.keys.append(event)
+        elif event.kind in (STOP, END) and run is not None:
+            run.ended = event.kind == END
+            run = None
+    return [run for run in runs if run.frames]
+
+
+def key_name(event: Event) -> str:
+    shift, ctrl, key = event.fields
+    return ("Ctrl+" if ctrl else "") + ("Shift+" if shift else "") + key
+
+
+def key_timeline(run: Run) -> list[dict]:
+    return [{"at_s": key.time - run.started, "key": key_name(key)} for key in run.keys]
+
+
+def percentiles_ms(values: list[float]) -> dict:
+    if len(values) < 2:
+        return {}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {
+        "p50": cuts[49] * 1000,
+        "p90": cuts[89] * 1000,
+        "p99": cuts[98] * 1000,
+        "max": max(values) * 1000,
+    }
+
+
+def open_engine(run: Run, scheduler: DeadlineScheduler) -> ReaderEngine:
+    if run.path is None:
+        raise ValueError("The log doesn't say which document was read")
+    engine = ReaderEngine(BookCache(), scheduler=scheduler)
+    words = engine.open_file(run.path)
+    if run.book_id and words.book_id and words.book_id != run.book_id:
+        print(f"Warning: {run.path} changed since it was logged", file=sys.stderr)
+    engine.load(words)
+    apply_settings(engine, run.settings)
+    return engine
+
+
+def apply_settings(engine: ReaderEngine, settings: tuple) -> None:
+    wpm, smart_pacing, chunk_size, orp = settings
+    engine.set_chunk_size(chunk_size)
+    engine.set_wpm(wpm)
+    engine.use_smart_pacing = smart_pacing
+    engine.use_orp = orp
+
+
+def timing_report(
+    lateness: list[float], scheduler: DeadlineScheduler, duration: float, late: float
+) -> dict:
+    return {
+        "requested_wpm": scheduler.requested_wpm,
+        "achieved_wpm": scheduler.words_shown / duration * 60 if duration > 0 else 0.0,
+        "late_frames": sum(value > late for value in lateness),
+        "resyncs": scheduler.resyncs,
+        "lateness_ms": percentiles_ms(lateness),
+    }
+
+
+# -----------------------------
+# Recorded Timing
+# -----------------------------
+def replay_recorded(run: Run, late: float) -> dict:
+    now = run.frames[0].time
+    scheduler = DeadlineScheduler(clock=lambda: now)
+    engine = open_engine(run, scheduler)
+    changes = iter(run.changes)
+    change = next(changes, None)
+    keys = iter(run.keys)
+    key = next(keys, None)
+
+    scheduler.start()
+    lateness = []
+    mismatches = seeks = 0
+    worst = []
+    expected_start = run.frames[0].fields[0]
+    for frame in run.frames:
+        now = frame.time
+        start, stop = frame.fields
+        # Changed before the flash -> its delay used the new settings
+        while change is not None and change.time <= now:
+            apply_settings(engine, change.fields)
+            change = next(changes, None)
+        pressed = []  # since the previous flash
+        while key is not None and key.time <= now:
+            pressed.append(key_name(key))
+            key = next(keys, None)
+
+        if start != expected_start:
+            seeks += 1  # moved while reading
+        if not engine.words.has(start):
+            break
+        if engine.frame_end(start) != stop:
+            mismatches += 1
+
+        lag = scheduler.lag()
+        lateness.append(lag)
+        worst.append((lag, now - run.started, start, pressed))
+        scheduler.schedule(engine.frame_delay(start, stop), stop - start)
+        expected_start = stop
+
+    worst.sort(key=itemgetter(0), reverse=True)
+    report = timing_report(lateness, scheduler, now - run.frames[0].time, late)
+    report.update(
+        frames=len(run.frames),
+        frame_mismatches=mismatches,
+        seeks=seeks,
+        worst_frames=[
+            {
+                "at_s": at,
+                "word_index": index,
+                "word": engine.words[index],
+                "late_ms": lag * 1000,
+                "keys": pressed,
+            }
+            for lag, at, index, pressed in worst[:WORST_FRAMES]
+        ],
+    )
+    engine.close()
+    return report
+
+
+# -----------------------------
+# Live Timing
+# -----------------------------
+async def replay_live(run: Run, late: float) -> dict:
+    # The same run again, in real time, with nothing but the engine
+    scheduler = DeadlineScheduler()
+    engine = open_engine(run, scheduler)
+    engine.jump_to(run.frames[0].fields[0])
+    changes = [(change.time - run.frames[0].time, change.fields) for change in run.changes]
+
+    lateness = []
+    engine.start()
+    started = time.monotonic()
+    async for start, stop in engine.frames():
+        lateness.append(scheduler.lag())
+        engine.frame_text(start, stop)  # the decode a real flash needs
+        while changes and changes[0][0] <= time.monotonic() - started:
+            apply_settings(engine, changes.pop(0)[1])
+        if len(lateness) >= len(run.frames):
+            engine.stop()
+    duration = time.monotonic() - started
+
+    report = timing_report(lateness, scheduler, duration, late)
+    report["frames"] = len(lateness)
+    engine.close()
+    return report
+
+
+def replay(path: Path, live: bool, late: float) -> dict:
+    runs = reading_runs(list(read_events(path)))
+    results = []
+    for number, run in enumerate(runs, 1):
+        print(f"run {number}/{len(runs)}: {len(run.frames)} flashes ...", file=sys.stderr)
+        result = {
+            "document": run.path,
+            "settings": dict(zip(("wpm", "smart_pacing", "chunk_size", "orp"), run.settings)),
+            "started_at_s": run.started,
+            "reached_end": run.ended,
+            "keys": key_timeline(run),
+        }
+        try:
+            result["recorded"] = replay_recorded(run, late)
+            if live:
+                result["live"] = asyncio.run(replay_live(run, late))
+        except (OSError, ValueError) as ex:
+            result["error"] = str(ex)
+        results.append(result)
+    return {"log": str(path), "late_ms": late * 1000, "runs": results}
+
+
+def newest_log() -> Path | None:
+    logs = sorted(LOG_DIR.glob("session-*.srlog"), key=lambda p: p.stat().st_mtime)
+    return logs[-1] if logs else None
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Replay a StaticReader event log")
+    parser.add_argument("log", nargs="?", help="event log (default: the newest one)")
+    parser.add_argument("--live", action="store_true", help="also read every run again now")
+    parser.add_argument("--late-ms", type=float, default=LATE_MS)
+    parser.add_argument("--output", help="JSON file (default: stdout)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    log = Path(args.log) if args.log else newest_log()
+    if log is None:
+        raise SystemExit(f"No event logs in {LOG_DIR}")
+    report = json.dumps(replay(log, args.live, args.late_ms / 1000), indent=2)
+    if args.output:
+        Path(args.output).write_text(report + "\n", encoding="utf-8")
+    else:
+        print(report)
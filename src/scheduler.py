@@ -0,0 +1,77 @@
+import time
+
+
+# -----------------------------
+# Deadline Scheduler
+# -----------------------------
+class DeadlineScheduler:
+    # Each word gets an absolute deadline on a monotonic clock, so the time
+    # spent rendering and playing sounds is taken out of the delay instead of
+    # being added on top of it.
+
+    MAX_LAG = 0.5  # seconds behind schedule before the backlog is dropped
+
+    def __init__(self, clock=time.monotonic) -> None:
+        self.clock = clock
+        self.started_at = 0.0
+        self.next_deadline = 0.0
+        self.last_delay = 0.0
+        self.words_shown = 0
+        self.requested_time = 0.0
+        self.skipped_frames = 0
+        self.resyncs = 0
+
+    def start(self) -> None:
+        now = self.clock()
+        self.started_at = now
+        self.next_deadline = now
+        self.last_delay = 0.0
+        self.words_shown = 0
+        self.requested_time = 0.0
+        self.skipped_frames = 0
+        self.resyncs = 0
+
+    def lag(self) -> float:
+        # Positive when the current word is shown after its deadline
+        return self.clock() - self.next_deadline
+
+    def is_behind(self) -> bool:
+        # Late by more than half a word -> the caller should skip optional
+        # per-frame work (like the word SFX) to catch up.
+        behind = self.words_shown > 0 and self.lag() > self.last_delay / 2
+        if behind:
+            self.skipped_frames += 1
+        return behind
+
+    def schedule(self, delay: float, words: int = 1) -> float:
+        # Books the word(s) currently shown for `delay` seconds and returns
+        # how long to sleep until the next flash is due.
+        self.words_shown += words
+        self.requested_time += delay
+        self.last_delay = delay
+        self.next_deadline += delay
+
+        now = self.clock()
+        remaining = self.next_deadline - now
+
+        if remaining < -self.MAX_LAG:
+            # Too far behind (e.g. the window was dragged or the machine
+            # stalled) -> resync instead of bursting through words.
+            self.next_deadline = now
+            self.resyncs += 1
+            return 0.0
+
+        return max(0.0, remaining)
+
+    @property
+    def measured_wpm(self) -> float:
+        elapsed = self.clock() - self.started_at
+        if self.words_shown == 0 or elapsed <= 0:
+            return 0.0
+        return self.words_shown / elapsed * 60
+
+    @property
+    def requested_wpm(self) -> float:
+        if self.words_shown == 0 or self.requested_time <= 0:
+            return 0.0
+        return self.words_shown / self.requested_time * 60
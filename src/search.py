@@ -0,0 +1,227 @@
+import heapq
+import string
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from functools import partial
+from itertools import accumulate, compress, count, repeat
+from typing import Iterator
+
+from word_store import LazyWords
+
+# Ignored at both ends of a word, so "dark." and "Dark" are the same token
+STRIP_CHARS = string.punctuation + "“”‘’«»„…—–"
+
+
+def normalize(word: str) -> str:
+    return word.strip(STRIP_CHARS).casefold()
+
+
+def _normalize_all(words: list[str]) -> Iterator[str]:
+    return map(str.casefold, map(str.strip, words, repeat(STRIP_CHARS)))
+
+
+# -----------------------------
+# Posting Lists
+# -----------------------------
+# Sorted arrays of the word indices a query term occurs at
+def _contains(positions: "array | PrefixHits", position: int) -> bool:
+    if isinstance(positions, PrefixHits):
+        return positions.contains(position)
+    i = bisect_left(positions, position)
+    return i < len(positions) and positions[i] == position
+
+
+def _walk(positions: "array | PrefixHits", pivot: int, backwards: bool) -> Iterator[int]:
+    # Positions after `pivot` in ascending order (before it, descending when
+    # `backwards`) -> only the hits looked at are read
+    if isinstance(positions, PrefixHits):
+        return positions.walk(pivot, backwards)
+    if backwards:
+        return map(positions.__getitem__, range(bisect_left(positions, pivot) - 1, -1, -1))
+    return map(positions.__getitem__, range(bisect_right(positions, pivot), len(positions)))
+
+
+class PrefixHits:
+    # The hits of a prefix term: every token in `ranks` of the sorted
+    # vocabulary. Their posting lists are never merged. A position is a hit
+    # if its token's rank is in `ranks`, and the hits are walked with a heap
+    # over the next hit of each token, or, when there are many tokens (so
+    # the hits are close together), by scanning the token ranks of the
+    # words from the pivot on.
+
+    SCAN_COST = 40  # words scanned in the time of one token's binary search
+
+    def __init__(
+        self,
+        tokens: list[str],
+        postings: dict[str, array],
+        ranks: range,
+        token_ranks: array,
+        count: int,
+    ) -> None:
+        self.tokens = tokens
+        self.postings = postings
+        self.ranks = ranks
+        self.token_ranks = token_ranks
+        self.count = count
+
+    def contains(self, position: int) -> bool:
+        return 0 <= position < len(self.token_ranks) and self.token_ranks[position] in self.ranks
+
+    def walk(self, pivot: int, backwards: bool) -> Iterator[int]:
+        words = len(self.token_ranks)
+        if len(self.tokens) * self.SCAN_COST < words / self.count:
+            lists = map(self.postings.__getitem__, self.tokens)
+            walks = map(_walk, lists, repeat(pivot), repeat(backwards))
+            return heapq.merge(*walks, reverse=backwards)
+
+        if backwards:
+            positions = range(min(pivot, words) - 1, -1, -1)
+        else:
+            positions = range(max(pivot + 1, 0), words)
+        hits = map(self.ranks.__contains__, map(self.token_ranks.__getitem__, positions))
+        return compress(positions, hits)
+
+    def __len__(self) -> int:
+        return self.count
+
+
+# -----------------------------
+# Search Index
+# -----------------------------
+class SearchIndex:
+    # Inverted index over a book: normalized token -> sorted array("I") of
+    # the word indices it occurs at. It is built on a worker thread in blocks
+    # of decoded words (reading as far as the source has been tokenized),
+    # after which a lookup is a few binary searches no matter how big the
+    # book is.
+    #
+    # Query terms are separated by spaces and must follow each other (a
+    # phrase); a term ending in "*" matches every word with that prefix. For
+    # those, the rank of every word's token in the sorted vocabulary is kept
+    # too: the tokens with a prefix are a range of ranks (`PrefixHits`).
+
+    BLOCK_WORDS = 1 << 16
+    MAX_CACHED_PREFIXES = 16  # hits of recent prefix terms
+
+    def __init__(self, words: LazyWords) -> None:
+        self.words = words
+        self._postings: dict[str, array] = defaultdict(partial(array, "I"))
+        self._vocabulary: list[str] = []  # sorted tokens, for prefix terms
+        self._token_ranks = array("I")  # word index -> rank of its token
+        self._rank_hits = array("Q", [0])  # hits of the tokens before each rank
+        self._prefixes: dict[str, PrefixHits] = {}
+        self._indexed = 0
+        self._cancelled = threading.Event()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def is_ready(self) -> bool:
+        return self._ready.is_set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        return self._ready.wait(timeout)
+
+    @property
+    def progress(self) -> float:
+        total = len(self.words)
+        return 1.0 if self.is_ready or not total else self._indexed / total
+
+    def _run(self) -> None:
+        try:
+            self._build()
+        except ValueError:
+            # The book was closed while we were reading it
+            if not self._cancelled.is_set():
+                raise
+
+    def _build(self) -> None:
+        postings = self._postings
+        token_ids: dict[str, int] = {}  # in order of appearance
+        word_token_ids = array("I")
+        while not self._cancelled.is_set():
+            start = self._indexed
+            # Tokenizes the next block if the loader hasn't got there yet
+            if not self.words.has(start):
+                break
+
+            block = self.words.word_range(start, start + self.BLOCK_WORDS)
+            if not block:  # the book was closed
+                return
+            tokens = list(_normalize_all(block))
+            for token, index in zip(tokens, count(start)):
+                postings[token].append(index)
+            for token in set(tokens).difference(token_ids):
+                token_ids[token] = len(token_ids)
+            word_token_ids.extend(map(token_ids.__getitem__, tokens))
+            self._indexed = start + len(block)
+        else:
+            return
+
+        postings.pop("", None)  # words made of punctuation only
+        self._postings = dict(postings)
+        self._vocabulary = sorted(self._postings)
+
+        # Renumbered by rank; punctuation-only words get a rank past the end
+        ranks = [len(self._vocabulary)] * len(token_ids)
+        for rank, token in enumerate(self._vocabulary):
+            ranks[token_ids[token]] = rank
+        self._token_ranks = array("I", map(ranks.__getitem__, word_token_ids))
+        hits = map(len, map(self._postings.__getitem__, self._vocabulary))
+        self._rank_hits = array("Q", accumulate(hits, initial=0))
+        self._ready.set()
+
+    def _term_positions(self, term: str) -> array | PrefixHits | None:
+        if not term.endswith("*"):
+            return self._postings.get(normalize(term))
+
+        prefix = normalize(term)
+        hits = self._prefixes.get(prefix)
+        if hits is None:
+            vocabulary = self._vocabulary
+            first = bisect_left(vocabulary, prefix)
+            last = bisect_left(vocabulary, prefix + "\U0010ffff", first)
+            if first == last:
+                return None
+            hits = PrefixHits(
+                vocabulary[first:last],
+                self._postings,
+                range(first, last),
+                self._token_ranks,
+                self._rank_hits[last] - self._rank_hits[first],
+            )
+            if len(self._prefixes) >= self.MAX_CACHED_PREFIXES:
+                # (an index may be shared by concurrent sessions)
+                self._prefixes.pop(next(iter(self._prefixes)), None)
+            self._prefixes[prefix] = hits
+        return hits
+
+    def find(self, query: str, index: int, backwards: bool = False) -> int | None:
+        # First word of the nearest hit after `index` (before it when
+        # `backwards`), None if there is none or the index isn't ready yet
+        terms = [term for term in query.split() if normalize(term)]
+        if not terms or not self.is_ready:
+            return None
+
+        postings = [self._term_positions(term) for term in terms]
+        if not all(postings):
+            return None
+
+        # Walk the rarest term's hits and check the rest of the phrase
+        # around each of them
+        anchor = min(range(len(postings)), key=lambda i: len(postings[i]))
+        others = [(offset, p) for offset, p in enumerate(postings) if offset != anchor]
+        for position in _walk(postings[anchor], index + anchor, backwards):
+            start = position - anchor
+            if all(_contains(p, start + offset) for offset, p in others):
+                return start
+        return None
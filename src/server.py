@@ -0,0 +1,150 @@
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from analytics import BookStats
+from audio import AudioEngine, NullBackend
+from book_cache import BookCache, CachedWords
+from importers import IMPORTERS
+from library import Library
+from reader_engine import ReaderEngine
+from search import SearchIndex
+from word_store import LazyWords
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8550
+
+
+def book_paths(paths: list[str | Path]) -> list[Path]:
+    # Files as given, plus the supported documents inside directories
+    found = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found.extend(
+                sorted(
+                    p for p in path.iterdir()
+                    if p.is_file() and p.suffix.lower() in IMPORTERS
+                )
+            )
+        else:
+            found.append(path)
+    return found
+
+
+# -----------------------------
+# Shared Books
+# -----------------------------
+@dataclass(eq=False)
+class SharedBook:
+    path: Path
+    book_id: str | None
+    words: LazyWords  # the server's own copy, open while the server runs
+    search_index: SearchIndex
+    stats: BookStats
+
+
+class SharedBooks:
+    # The books a server offers, tokenized once for every session. Each book
+    # is tokenized (or found in the book cache) on a worker pool as soon as
+    # the server starts, together with its search index and statistics.
+    #
+    # Sessions get a CachedWords of their own over the same cache entry:
+    # opening one is O(1), the pages of the read-only map are shared by the
+    # OS, and per-session state (chunk starts, the cursor) stays apart. A
+    # session asking for a book that isn't ready yet waits for the one
+    # tokenization in progress instead of starting another one.
+
+    WORKERS = 2
+
+    def __init__(
+        self, paths: list[Path], book_cache: BookCache, workers: int = WORKERS
+    ) -> None:
+        self.paths = list(paths)
+        self.book_cache = book_cache
+        self._engine = ReaderEngine(book_cache)  # only opens files
+        self._lock = threading.Lock()
+        self._books: dict[Path, Future] = {}
+        self._by_id: dict[str, SharedBook] = {}
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="books")
+
+    def warm(self) -> None:
+        for path in self.paths:
+            self._future(path)
+
+    def open(self, path: str | Path) -> LazyWords:
+        # A word source of the session's own
+        path = Path(path)
+        book = self._future(path).result()
+        if book.book_id is not None:
+            words = self.book_cache.load(book.book_id, self._engine.pacing)
+            if words is not None:
+                return words
+        # Not cacheable, or evicted since -> the session reads its own copy
+        return self._engine.open_file(path)
+
+    def shared(self, book_id: str | None) -> SharedBook | None:
+        # The tokenized book `book_id` once it's ready
+        with self._lock:
+            return self._by_id.get(book_id) if book_id is not None else None
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            futures = list(self._books.values())
+            self._books.clear()
+            self._by_id.clear()
+        for future in futures:
+            if future.done() and future.exception() is None:
+                future.result().words.close()
+
+    def _future(self, path: Path) -> Future:
+        with self._lock:
+            future = self._books.get(path)
+            if future is None:
+                future = self._books[path] = self._pool.submit(self._prepare, path)
+            return future
+
+    def _prepare(self, path: Path) -> SharedBook:
+        words = self._engine.open_file(path)
+        if not isinstance(words, CachedWords):
+            words.load_all()
+            self.book_cache.store(words)
+            cached = self.book_cache.load(words.book_id, self._engine.pacing)
+            if cached is not None:
+                words.close()
+                words = cached
+
+        search_index = SearchIndex(words)
+        search_index.start()
+        search_index.wait()
+        book = SharedBook(path, words.book_id, words, search_index, BookStats(words))
+        if book.book_id is not None:
+            with self._lock:
+                self._by_id[book.book_id] = book
+        return book
+
+
+# -----------------------------
+# Reader Server
+# -----------------------------
+class ReaderServer:
+    # Process-wide state of server mode. Every connection (Flet page) gets
+    # its own ReaderEngine, library and in-memory sessions; these are
+    # shared: the books, one silent audio engine (audio is off) and the
+    # prefetch workers of all the libraries.
+
+    def __init__(self, paths: list[Path], book_cache: BookCache | None = None) -> None:
+        self.books = SharedBooks(paths, book_cache or BookCache())
+        self.audio = AudioEngine(NullBackend())
+        self.prefetch_pool = ThreadPoolExecutor(
+            Library.WORKERS, thread_name_prefix="prefetch"
+        )
+
+    def start(self) -> None:
+        self.books.warm()
+
+    def close(self) -> None:
+        self.prefetch_pool.shutdown(wait=False, cancel_futures=True)
+        self.books.close()
+        self.audio.close()
@@ -0,0 +1,148 @@
+import copy
+import json
+import os
+import tempfile
+import threading
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+SESSION_DIR = (
+    Path(os.environ.get("XDG_DATA_HOME") or Path.home() / ".local" / "share")
+    / "StaticReader"
+    / "sessions"
+)
+
+
+# -----------------------------
+# Reading Session
+# -----------------------------
+@dataclass
+class Bookmark:
+    name: str
+    word_index: int
+
+
+@dataclass
+class ReadingSession:
+    book_id: str
+    word_index: int = 0
+    wpm: int = 60
+    use_smart_pacing: bool = False
+    chunk_size: int = 0
+    use_orp: bool = False
+    bookmarks: list[Bookmark] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ReadingSession":
+        data = dict(data)
+        bookmarks = [Bookmark(**b) for b in data.pop("bookmarks", [])]
+        return cls(**data, bookmarks=bookmarks)
+
+    def add_bookmark(self, name: str, word_index: int) -> Bookmark:
+        bookmark = Bookmark(name, word_index)
+        self.bookmarks.append(bookmark)
+        self.bookmarks.sort(key=lambda b: b.word_index)
+        return bookmark
+
+    def next_bookmark(self, word_index: int, backwards: bool = False) -> Bookmark | None:
+        if backwards:
+            earlier = [b for b in self.bookmarks if b.word_index < word_index]
+            return earlier[-1] if earlier else None
+        return next((b for b in self.bookmarks if b.word_index > word_index), None)
+
+
+# -----------------------------
+# Session Store
+# -----------------------------
+class SessionStore:
+    # One JSON file per book. `save` only hands a snapshot to a writer
+    # thread (keeping just the newest snapshot per book), so the reader loop
+    # never waits on the disk. Files are replaced atomically, so a crash
+    # leaves either the old or the new session, never a torn one.
+
+    def __init__(self, directory: Path = SESSION_DIR) -> None:
+        self.directory = Path(directory)
+        self._pending: dict[str, dict] = {}
+        self._writing = False
+        self._condition = threading.Condition()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _path(self, book_id: str) -> Path:
+        return self.directory / f"{book_id}.json"
+
+    def load(self, book_id: str) -> ReadingSession | None:
+        # None when the book has no (readable) saved session
+        with self._condition:
+            pending = self._pending.get(book_id)
+        if pending is not None:
+            return ReadingSession.from_dict(copy.deepcopy(pending))
+
+        try:
+            data = json.loads(self._path(book_id).read_text(encoding="utf-8"))
+            return ReadingSession.from_dict(data)
+        except (OSError, ValueError, TypeError):
+            return None
+
+    def save(self, session: ReadingSession) -> None:
+        snapshot = asdict(session)
+        with self._condition:
+            self._pending[session.book_id] = snapshot
+            self._condition.notify_all()
+
+    def flush(self, timeout: float | None = None) -> bool:
+        # Waits until every queued snapshot is on disk
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._pending and not self._writing, timeout
+            )
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending)
+                book_id, snapshot = self._pending.popitem()
+                self._writing = True
+
+            try:
+                self._write(book_id, snapshot)
+            except OSError as ex:
+                print(f"Session not saved: {ex}")
+            finally:
+                with self._condition:
+                    self._writing = False
+                    self._condition.notify_all()
+
+    def _write(self, book_id: str, snapshot: dict) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", dir=self.directory, suffix=".tmp", delete=False, encoding="utf-8"
+        ) as f:
+            tmp_path = f.name
+            try:
+                json.dump(snapshot, f)
+            except OSError:
+                f.close()
+                os.remove(tmp_path)
+                raise
+        os.replace(tmp_path, self._path(book_id))
+
+
+class MemorySessionStore:
+    # Same interface as SessionStore, kept in memory for one connection
+    # (server mode: readers of the same book must not share a session file)
+
+    def __init__(self) -> None:
+        self._sessions: dict[str, dict] = {}
+
+    def load(self, book_id: str) -> ReadingSession | None:
+        snapshot = self._sessions.get(book_id)
+        if snapshot is None:
+            return None
+        return ReadingSession.from_dict(copy.deepcopy(snapshot))
+
+    def save(self, session: ReadingSession) -> None:
+        self._sessions[session.book_id] = asdict(session)
+
+    def flush(self, timeout: float | None = None) -> bool:
+        return True
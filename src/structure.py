@@ -0,0 +1,42 @@
+from bisect import bisect_left, bisect_right
+from typing import Sequence
+
+# -----------------------------
+# Chapter Detection
+# -----------------------------
+# A short paragraph that starts with one of these words is a chapter heading
+CHAPTER_WORDS = frozenset(
+    ("chapter", "part", "book", "prologue", "epilogue", "interlude")
+)
+MAX_HEADING_WORDS = 8
+HEADING_STRIP_CHARS = ".:-–—*_#"
+
+
+def is_chapter_heading(first_word: str, word_count: int) -> bool:
+    if word_count > MAX_HEADING_WORDS:
+        return False
+    if first_word.startswith("#"):  # Markdown heading in a plain text file
+        return True
+    return first_word.strip(HEADING_STRIP_CHARS).lower() in CHAPTER_WORDS
+
+
+class Heading(str):
+    # A heading marked up by the document (HTML <h1>, Markdown "# "). The
+    # importers yield it as a chunk of its own, without the markup, and the
+    # word sources start a paragraph and a chapter at its first word.
+    __slots__ = ()
+
+
+# -----------------------------
+# Structural Navigation
+# -----------------------------
+# `starts` are the sorted first-word indices of sentences, paragraphs or
+# chapters; both lookups are a single binary search.
+def next_boundary(starts: Sequence[int], index: int) -> int | None:
+    i = bisect_right(starts, index)
+    return starts[i] if i < len(starts) else None
+
+
+def previous_boundary(starts: Sequence[int], index: int) -> int | None:
+    i = bisect_left(starts, index) - 1
+    return starts[i] if i >= 0 else None
@@ -0,0 +1,53 @@
+import sys
+import time
+from pathlib import Path
+from typing import TextIO
+
+from book_cache import BookCache
+from reader_engine import ReaderEngine
+
+
+# -----------------------------
+# Terminal Reader (headless)
+# -----------------------------
+async def read_in_terminal(
+    path: str | Path,
+    wpm: int,
+    smart_pacing: bool = False,
+    chunk_size: int = 0,
+    start: int = 0,
+    out: TextIO = sys.stdout,
+) -> None:
+    # Streams the book into the terminal, one flash per line redraw, with the
+    # same engine, pacing and scheduler as the window
+    engine = ReaderEngine(BookCache())
+    words = engine.open_file(path)
+    if not words.has(0):
+        words.close()
+        raise ValueError(f"No words in {path}")
+
+    engine.load(words)
+    engine.set_chunk_size(chunk_size)
+    engine.set_wpm(wpm)
+    engine.use_smart_pacing = smart_pacing
+    engine.jump_to(start)
+
+    engine.start()
+    started = time.monotonic()
+    width = 0
+    try:
+        async for first, stop in engine.frames():
+            text = engine.frame_text(first, stop)
+            out.write("\r" + text.ljust(width))
+            out.flush()
+            width = len(text)
+        engine.complete()
+    finally:
+        engine.stop()
+        elapsed = time.monotonic() - started
+        measured = engine.scheduler.measured_wpm
+        out.write(f"\n{engine.word_index or len(words)} / {len(words)} words, ")
+        out.write(f"{elapsed:.1f} s, {measured:.0f} WPM\n")
+        # Fully tokenized now -> cached for the next run
+        engine.book_cache.store(words)
+        engine.close()
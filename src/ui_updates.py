@@ -0,0 +1,56 @@
+import functools
+import threading
+from typing import Callable
+
+import flet as ft
+
+
+# -----------------------------
+# Coalesced UI Updates
+# -----------------------------
+class UpdateCoalescer:
+    # Handlers mark the controls they changed instead of calling
+    # `page.update()`. Everything marked while a batched handler runs is
+    # sent in one `page.update(*controls)` when the outermost batched call
+    # returns, so nested helpers (adjust_wpm -> wpm_handler,
+    # set_btn_visibilities, ...) no longer cost one round-trip each, and
+    # only the changed controls are diffed. Marking the page itself falls
+    # back to a full page update.
+
+    def __init__(self, page: ft.Page) -> None:
+        self.page = page
+        self._dirty: dict[int, ft.Control | ft.Page] = {}
+        self._lock = threading.Lock()
+        # Flet runs sync handlers on worker threads -> nesting is per thread
+        self._local = threading.local()
+
+    def mark(self, *controls: ft.Control | ft.Page) -> None:
+        with self._lock:
+            for control in controls:
+                self._dirty[id(control)] = control
+
+    def flush(self) -> None:
+        with self._lock:
+            controls = list(self._dirty.values())
+            self._dirty.clear()
+
+        if not controls:
+            return
+        if any(control is self.page for control in controls):
+            self.page.update()
+        else:
+            self.page.update(*controls)
+
+    def batched(self, handler: Callable) -> Callable:
+        @functools.wraps(handler)
+        def wrapper(*args, **kwargs):
+            depth = getattr(self._local, "depth", 0)
+            self._local.depth = depth + 1
+            try:
+                return handler(*args, **kwargs)
+            finally:
+                self._local.depth = depth
+                if depth == 0:
+                    self.flush()
+
+        return wrapper
@@ -0,0 +1,103 @@
+from array import array
+from functools import lru_cache
+from itertools import repeat
+from operator import add, itemgetter, mul
+from pathlib import Path
+from typing import Sequence
+
+# Common English words, most frequent first (shipped with the app)
+FREQUENCY_FILE = Path(__file__).resolve().parent.parent / "assets" / "data" / "word_frequency.txt"
+
+# -----------------------------
+# Word Classes
+# -----------------------------
+WORD_COMMON = 0  # among the most frequent words
+WORD_FREQUENT = 1
+WORD_KNOWN = 2  # in the frequency table
+WORD_RARE = 3  # not in the table
+WORD_NAME = 4  # capitalized and not in the table (proper nouns)
+WORD_NUMBER = 5
+WORD_CLASS_COUNT = 6
+
+COMMON_RANKS = 150  # the first 150 words of the table are common
+FREQUENT_RANKS = 600
+
+# Stripped before the lookup, so "(Hello," is "hello"
+STRIP_CHARS = "\"'()[]{}<>.,;:!?*_-–—…“”‘’"
+_APOSTROPHES = str.maketrans("‘’", "''")
+# Deleted before the digit check, so "1,000", "3.14" and "50%" are numbers
+_NUMBER_CHARS = str.maketrans("", "", ",.:/%$€£+-–")
+_UNLISTED = 3
+
+
+def _band(rank: int) -> int:
+    if rank < COMMON_RANKS:
+        return WORD_COMMON
+    return WORD_FREQUENT if rank < FREQUENT_RANKS else WORD_KNOWN
+
+
+@lru_cache(maxsize=1)
+def frequency_bands() -> dict[str, int]:
+    # Word -> WORD_COMMON / WORD_FREQUENT / WORD_KNOWN, read on first use
+    try:
+        with open(FREQUENCY_FILE, encoding="utf-8") as f:
+            lines = [line.strip() for line in f]
+    except OSError as ex:
+        print(f"Word frequency table unavailable: {ex}")
+        return {}
+
+    bands: dict[str, int] = {}
+    ranked = (line for line in lines if line and not line.startswith("#"))
+    for rank, word in enumerate(ranked):
+        bands.setdefault(word, _band(rank))
+    return bands
+
+
+@lru_cache(maxsize=2)
+def _class_table(has_bands: bool) -> tuple[int, ...]:
+    # _class_table[band * 4 + is_number * 2 + is_capitalized]: words not in
+    # the table are numbers, names or rare words. Without a table nothing
+    # counts as rare.
+    table = []
+    for band in range(_UNLISTED + 1):
+        for is_number in (False, True):
+            for is_capitalized in (False, True):
+                if band != _UNLISTED:
+                    table.append(band)
+                elif is_number:
+                    table.append(WORD_NUMBER)
+                elif is_capitalized:
+                    table.append(WORD_NAME)
+                else:
+                    table.append(WORD_RARE if has_bands else WORD_KNOWN)
+    return tuple(table)
+
+
+def _classify(words: Sequence[str]) -> map:
+    bands = frequency_bands()
+    keys = list(map(str.strip, words, repeat(STRIP_CHARS)))
+
+    lowered = map(str.translate, map(str.lower, keys), repeat(_APOSTROPHES))
+    listed = map(bands.get, lowered, repeat(_UNLISTED))
+    numbers = map(str.isdigit, map(str.translate, keys, repeat(_NUMBER_CHARS)))
+    capitalized = map(str.isupper, map(itemgetter(slice(0, 1)), keys))
+
+    table = _class_table(bool(bands))
+    index = map(
+        add,
+        map(add, map(mul, listed, repeat(4)), map(mul, numbers, repeat(2))),
+        capitalized,
+    )
+    return map(table.__getitem__, index)
+
+
+def word_classes(tokens: Sequence[str] | Sequence[bytes]) -> array:
+    # Word class of every token, in bulk. Text repeats the same words a lot,
+    # so only the distinct tokens are classified (C-level map() chains, no
+    # per-word Python code); UTF-8 tokens are decoded with one decode() call.
+    distinct = list(set(tokens))
+    words = distinct
+    if distinct and isinstance(distinct[0], bytes):
+        words = b"\n".join(distinct).decode("utf-8", errors="ignore").split("\n")
+    classes = dict(zip(distinct, _classify(words)))
+    return array("B", map(classes.__getitem__, tokens))
@@ -0,0 +1,701 @@
+import mmap
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left
+from itertools import accumulate, compress, count, islice
+from operator import add, itemgetter, sub
+from pathlib import Path
+from typing import Callable, Iterable, Iterator
+from chunking import phrase_breaks, split_phrases
+from orp import orp_pivots
+from pacing import (
+    MAX_TRACKED_LENGTH,
+    PUNCT_STOP,
+    PUNCTUATION_BYTE_TABLE,
+    PacingModel,
+    punctuation_classes,
+)
+from probes import probes
+from structure import Heading, is_chapter_heading, next_boundary, previous_boundary
+from word_frequency import word_classes
+
+
+# -----------------------------
+# Compact Word Store
+# -----------------------------
+def decode_words(buffer: bytes, starts: Iterable[int], ends: Iterable[int]) -> list[str]:
+    # Decodes many byte ranges with a single decode() call (words never
+    # contain "\n", so it splits them apart again)
+    joined = b"\n".join(map(buffer.__getitem__, map(slice, starts, ends)))
+    return joined.decode("utf-8", errors="ignore").split("\n") if joined else []
+
+
+class WordStore:
+    # All words live in one contiguous UTF-8 buffer; word i is the byte range
+    # offsets[i]:offsets[i + 1]. That is ~4 bytes of overhead per word instead
+    # of a full `str` object, and indexing / len() are O(1).
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self._offsets = array("I", [0])
+
+    def extend(self, words: Iterable[str]) -> None:
+        encoded = [w.encode("utf-8") for w in words]
+        if not encoded:
+            return
+        self._buffer += b"".join(encoded)
+        # accumulate() yields the initial value first -> skip it
+        self._offsets.extend(
+            islice(accumulate(map(len, encoded), initial=self._offsets[-1]), 1, None)
+        )
+
+    def append(self, word: str) -> None:
+        self.extend((word,))
+
+    @property
+    def buffer(self) -> bytearray:
+        return self._buffer
+
+    @property
+    def offsets(self) -> array:
+        return self._offsets
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._buffer) + self._offsets.itemsize * len(self._offsets)
+
+    def __getitem__(self, index: int) -> str:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("word index out of range")
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return self._buffer[start:end].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+
+# -----------------------------
+# Lazy Word Sources
+# -----------------------------
+class LazyWords(ABC):
+    # Shared random-access interface of the word sources. Words are produced
+    # on demand by `_fill`, so seeking forward only costs the words between
+    # the end of the loaded range and the target (plus a read-ahead).
+    #
+    # Next to the words, every source keeps per-word lengths, punctuation
+    # classes, word classes (frequency band, name, number), smart-pacing
+    # factors and ORP pivots (the letter to highlight), computed in bulk as
+    # words are added, so the reader loop only does one array lookup per word.
+    #
+    # The structure of the text is indexed the same way: sorted arrays of the
+    # first word of every sentence (after . ! ?), paragraph (after a blank
+    # line) and chapter (a `Heading` chunk, or a short paragraph starting
+    # with "Chapter", "Part", ...), so structural jumps are a binary search.
+    #
+    # With chunk mode on (`set_chunk_size`), phrases between punctuation are
+    # cut into `chunk_size` words. Chunks are computed a window of words at
+    # a time, starting at the phrase the reader is in (`chunk_end`), so
+    # changing the chunk size costs nothing up front. The last phrase of the
+    # loaded words may still grow, so it is only chunked once its end is
+    # known.
+    #
+    # A background loader and the UI can both advance the same source: they
+    # take turns on `_fill_lock`, tokenize a batch without holding `_lock`
+    # and only take `_lock` to publish it (or to chunk). The word count
+    # grows last, so the loaded words (and their features) are read
+    # without any lock.
+    #
+    # Sources implement the abstract methods (how words are produced, stored
+    # and exported); a source missing one can't be created.
+
+    READ_AHEAD = 2048  # words tokenized past the requested index
+    CHUNK_WINDOW = 4096  # words chunked at a time in chunk mode
+
+    def __init__(self, pacing: PacingModel | None = None) -> None:
+        self._lock = threading.RLock()
+        self._fill_lock = threading.Lock()
+        self.book_id: str | None = None  # book cache key, set by the importer
+        self.pacing = pacing or PacingModel()
+        self.lengths = array("H")
+        self.punctuation = array("B")
+        self.word_classes = array("B")
+        self.pacing_factors = array("f")
+        self.orp_pivots = array("B")
+        self.sentence_starts = array("I")
+        self.paragraph_starts = array("I")
+        self.chapter_starts = array("I")
+        self.chunk_size = 0  # words per chunk, 0 = chunk mode off
+        self.chunk_starts = array("I")  # chunk starts in [_chunk_from, _chunked)
+        self._chunk_from = 0
+        self._chunked = 0
+
+    def _features(
+        self, lengths: list[int], punctuation: Iterable[int], classes: array
+    ) -> tuple[array, ...]:
+        # Per-word arrays of a tokenized batch, computed before it's published
+        if max(lengths, default=0) > MAX_TRACKED_LENGTH:
+            lengths = [min(n, MAX_TRACKED_LENGTH) for n in lengths]
+        lengths = array("H", lengths)
+        punctuation = array("B", punctuation)
+
+        base = len(self.lengths)
+        sentences = array("I", [0] if base == 0 and lengths else [])
+        # A sentence starts after every word ending in . ! ?
+        sentences.extend(
+            compress(
+                range(base + 1, base + 1 + len(punctuation)),
+                map(PUNCT_STOP.__eq__, punctuation),
+            )
+        )
+        return (
+            sentences,
+            lengths,
+            punctuation,
+            classes,
+            self.pacing.factors(lengths, punctuation, classes),
+            orp_pivots(lengths, punctuation),
+        )
+
+    def _add_features(
+        self,
+        sentences: array,
+        lengths: array,
+        punctuation: array,
+        classes: array,
+        factors: array,
+        pivots: array,
+    ) -> None:
+        # Under `_lock`, before the words themselves are added
+        self.sentence_starts.extend(sentences)
+        self.lengths.extend(lengths)
+        self.punctuation.extend(punctuation)
+        self.word_classes.extend(classes)
+        self.pacing_factors.extend(factors)
+        self.orp_pivots.extend(pivots)
+
+    def _add_paragraph_start(self, index: int) -> None:
+        # Called once the paragraph's first word is loaded
+        starts = self.paragraph_starts
+        if starts and index <= starts[-1]:
+            return
+
+        # The previous paragraph is complete now -> was it a heading?
+        if starts and is_chapter_heading(self._word(starts[-1]), index - starts[-1]):
+            if not self.chapter_starts or self.chapter_starts[-1] < starts[-1]:
+                self.chapter_starts.append(starts[-1])
+
+        starts.append(index)
+
+        # A paragraph also starts a sentence (headings have no full stop)
+        sentences = self.sentence_starts
+        i = bisect_left(sentences, index)
+        if i == len(sentences) or sentences[i] != index:
+            sentences.insert(i, index)
+
+    def _add_chapter_start(self, index: int) -> None:
+        # A heading marked up by the document
+        self._add_paragraph_start(index)
+        if not self.chapter_starts or self.chapter_starts[-1] < index:
+            self.chapter_starts.append(index)
+
+    def chunk_end(self, index: int) -> int | None:
+        # End of the chunk flashed from `index` on (the next chunk start),
+        # None while the phrase at `index` is still loading
+        with self._lock:
+            if not self._chunk_from <= index < self._chunked:
+                self._chunk_window(index)
+                if not self._chunk_from <= index < self._chunked:
+                    return None
+            end = next_boundary(self.chunk_starts, index)
+            return self._chunked if end is None else end
+
+    def _chunk_window(self, index: int) -> None:
+        # Chunks the loaded words from the chunk containing `index` on, as if
+        # the book had been chunked from the start
+        complete = self.is_complete
+        loaded = len(self)
+        if index == self._chunked:
+            start = index  # reading on: the last window ended on a chunk start
+        else:
+            phrase = self._phrase_start(index)
+            # The chunk of the phrase `index` is in (phrases are cut from
+            # their start in steps of chunk_size)
+            start = phrase + (index - phrase) // self.chunk_size * self.chunk_size
+        stop = min(index + self.CHUNK_WINDOW, loaded)
+        breaks = phrase_breaks(
+            self.lengths, self.punctuation, self.paragraph_starts, start, stop
+        )
+        if stop == loaded and complete:
+            if breaks[-1] != stop:
+                breaks.append(stop)  # the end of the book ends the last phrase
+        elif stop - index == self.CHUNK_WINDOW and breaks[-1] <= index:
+            # A phrase longer than the window goes on past `stop`, so its
+            # chunks are known up to the last whole chunk before it
+            phrase = breaks[-1]
+            breaks.append(phrase + (stop - phrase) // self.chunk_size * self.chunk_size)
+        self.chunk_starts = array("I", split_phrases(breaks, self.chunk_size))
+        self._chunk_from, self._chunked = start, breaks[-1]
+
+    def _phrase_start(self, index: int) -> int:
+        # Last phrase break at or before `index`. A sentence start always is
+        # one, so the scan goes back from `index` in growing steps until it
+        # finds a break or reaches the sentence start.
+        sentence = previous_boundary(self.sentence_starts, index + 1) or 0
+        span = self.CHUNK_WINDOW // 2
+        while True:
+            first = max(index - span, sentence)
+            start = phrase_breaks(
+                self.lengths, self.punctuation, self.paragraph_starts, first, index
+            )[-1]
+            if start > first or first == sentence:
+                return start
+            span *= 2
+
+    def set_chunk_size(self, size: int) -> None:
+        # 0 -> chunk mode off; chunks are recomputed when they're needed
+        with self._lock:
+            if size == self.chunk_size:
+                return
+            self.chunk_size = size
+            self.chunk_starts = array("I")
+            self._chunk_from = self._chunked = 0
+
+    def set_pacing(self, pacing: PacingModel) -> None:
+        # Only needed when the pacing constants change
+        self.pacing = pacing
+        self.pacing_factors = pacing.factors(self.lengths, self.punctuation, self.word_classes)
+
+    @property
+    @abstractmethod
+    def is_complete(self) -> bool: ...
+
+    @abstractmethod
+    def _fill(self, wanted: int) -> None: ...
+
+    @abstractmethod
+    def _word(self, index: int) -> str: ...
+
+    @property
+    def progress(self) -> float | None:
+        # Loaded fraction of the input, None when the size is unknown
+        return 1.0 if self.is_complete else None
+
+    def has(self, index: int) -> bool:
+        # Seeks forward (tokenizing) if needed
+        if index < 0:
+            return False
+        if index >= len(self):
+            with self._fill_lock:
+                self._fill(index + 1 + self.READ_AHEAD)
+        return index < len(self)
+
+    def load_step(self) -> None:
+        with self._fill_lock:
+            self._fill(len(self) + self.READ_AHEAD)
+
+    def load_all(self) -> None:
+        while not self.is_complete:
+            self.load_step()
+
+    def close(self) -> None:
+        pass
+
+    def word_range(self, start: int, stop: int) -> list[str]:
+        # Decoded loaded words in [start, stop)
+        return list(map(self._word, range(start, min(stop, len(self)))))
+
+    @abstractmethod
+    def export_words(self) -> tuple[bytes, array]:
+        # (UTF-8 buffer, offsets) of the loaded words, in WordStore layout
+        ...
+
+    def __getitem__(self, index: int) -> str:
+        if not self.has(index):
+            raise IndexError("word index out of range")
+        return self._word(index)
+
+    @abstractmethod
+    def __len__(self) -> int:
+        # Number of words tokenized so far (the total once `is_complete`)
+        ...
+
+
+class StreamingWords(LazyWords):
+    # Tokenizes an iterator of text chunks on demand. Only as many chunks are
+    # consumed as needed to reach the requested index, so the first word is
+    # available right after the first chunk is read.
+
+    _PARAGRAPH_BREAK = re.compile(r"\n[^\S\n]*\n")
+
+    def __init__(self, chunks: Iterable[str], pacing: PacingModel | None = None) -> None:
+        super().__init__(pacing)
+        self._chunks: Iterator[str] | None = iter(chunks)
+        self._words = WordStore()
+        # Tail of the last chunk (a partial word or a whitespace run, so
+        # neither words nor paragraph breaks are split between chunks)
+        self._carry = ""
+        self._paragraph_pending = True  # next word starts a paragraph
+
+    @property
+    def is_complete(self) -> bool:
+        return self._chunks is None
+
+    def _fill(self, wanted: int) -> None:
+        while self._chunks is not None and len(self._words) < wanted:
+            chunk = next(self._chunks, None)
+
+            if chunk is None:
+                self._chunks = None
+                text, self._carry = self._carry, ""
+            elif not chunk:
+                continue
+            elif type(chunk) is Heading:
+                text, self._carry = self._carry, ""
+                self._add_text(text)
+                self._add_heading(chunk)
+                continue
+            else:
+                text = self._carry + chunk
+                if text[-1].isspace():
+                    stripped = text.rstrip()
+                    text, self._carry = stripped, text[len(stripped):]
+                else:
+                    tail = text.rsplit(None, 1)[-1]
+                    text, self._carry = text[: len(text) - len(tail)], tail
+
+            self._add_text(text)
+
+    def _add_text(self, text: str) -> None:
+        tokens: list[str] = []
+        paragraphs = []
+        for i, paragraph in enumerate(self._PARAGRAPH_BREAK.split(text)):
+            if i > 0:
+                self._paragraph_pending = True
+
+            words = paragraph.split()
+            if not words:
+                continue
+
+            if self._paragraph_pending:
+                self._paragraph_pending = False
+                paragraphs.append(len(self) + len(tokens))
+            tokens += words
+
+        if tokens:
+            self._add_tokens(tokens, paragraphs)
+
+    def _add_heading(self, heading: Heading) -> None:
+        # A paragraph of its own that starts a chapter
+        tokens = heading.split()
+        if tokens:
+            self._add_tokens(tokens, chapters=[len(self)])
+            self._paragraph_pending = True
+
+    def close(self) -> None:
+        with self._lock:
+            self._chunks = None
+
+    def export_words(self) -> tuple[bytes, array]:
+        return self._words.buffer, self._words.offsets
+
+    def _add_tokens(
+        self, tokens: list[str], paragraphs: Iterable[int] = (), chapters: Iterable[int] = ()
+    ) -> None:
+        features = self._features(
+            list(map(len, tokens)), punctuation_classes(tokens), word_classes(tokens)
+        )
+        with self._lock:
+            self._add_features(*features)
+            self._words.extend(tokens)
+            for index in paragraphs:
+                self._add_paragraph_start(index)
+            for index in chapters:
+                self._add_chapter_start(index)
+
+    def _word(self, index: int) -> str:
+        return self._words[index]
+
+    def word_range(self, start: int, stop: int) -> list[str]:
+        offsets = self._words.offsets
+        stop = min(stop, len(self))
+        return decode_words(
+            self._words.buffer, offsets[start:stop], offsets[start + 1:stop + 1]
+        )
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+
+class MappedWords(LazyWords):
+    # Memory-maps a UTF-8 text file and indexes word boundaries straight over
+    # the raw bytes. Each scan window is split on single spaces in C, and the
+    # word offsets come from a running sum of the piece lengths, so there is
+    # no per-word Python code. Only the word being shown is ever decoded, so
+    # opening a huge file is near-instant and resident memory stays flat.
+    #
+    # Words are split on the same whitespace as str.split(): before the
+    # split, every whitespace character (including the UTF-8 encoded ones
+    # like no-break and em spaces) is blanked out byte for byte, so offsets
+    # into the window stay valid.
+
+    MIN_SCAN_WINDOW = 1 << 16  # first window is small -> first word is fast
+    SCAN_WINDOW = 1 << 20  # bytes scanned per `_fill` step (after ramp-up)
+    BATCH_WORDS = 1 << 14  # words published at a time
+    # Whitespace besides ASCII's, as UTF-8: U+0085, U+00A0 | U+1680,
+    # U+2000-U+200A, U+2028, U+2029, U+202F, U+205F, U+3000
+    _UNICODE_SPACES_2 = rb"\xc2[\x85\xa0]"
+    _UNICODE_SPACES_3 = rb"\xe1\x9a\x80|\xe2\x80[\x80-\x8a\xa8\xa9\xaf]|\xe2\x81\x9f|\xe3\x80\x80"
+    _WIDE_SPACES_2 = re.compile(_UNICODE_SPACES_2)
+    _WIDE_SPACES_3 = re.compile(_UNICODE_SPACES_3)
+    _WORD_PATTERN = re.compile(
+        rb"(?:(?!" + _UNICODE_SPACES_2 + rb"|" + _UNICODE_SPACES_3 + rb")[^\s\x1c-\x1f])+"
+    )
+    # Over a blanked window (only " " and "\n" are left)
+    _PARAGRAPH_BREAK = re.compile(rb"\n *\n")
+    _SPACES_TO_BLANK = bytes.maketrans(b"\t\r\x0b\x0c\x1c\x1d\x1e\x1f", b" " * 8)
+    _NEWLINES_TO_BLANK = bytes.maketrans(b"\n", b" ")
+
+    def __init__(self, path: str | Path, pacing: PacingModel | None = None) -> None:
+        super().__init__(pacing)
+        self._file = open(path, "rb")
+        size = Path(path).stat().st_size
+        # Offsets must be able to address the whole file
+        typecode = "I" if size < 1 << 32 else "Q"
+        self._starts = array(typecode)
+        self._ends = array(typecode)
+        self._scan_pos = 0
+        self._window = min(self.MIN_SCAN_WINDOW, self.SCAN_WINDOW)
+        self._paragraph_pending = True  # next word starts a paragraph
+        # The whitespace scanned since the last word has a line break
+        self._line_break_pending = False
+
+        if size == 0:  # mmap can't map empty files
+            self._map = None
+            self._size = 0
+            return
+
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._size = len(self._map)
+        if hasattr(self._map, "madvise"):
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+
+    @property
+    def is_complete(self) -> bool:
+        return self._map is None or self._scan_pos >= self._size
+
+    @property
+    def progress(self) -> float | None:
+        return 1.0 if self.is_complete else self._scan_pos / self._size
+
+    def _fill(self, wanted: int) -> None:
+        while not self.is_complete and len(self._starts) < wanted:
+            scan_pos = self._scan_pos
+            end_pos = min(scan_pos + self._window, self._size)
+            window = self._map[scan_pos:end_pos]
+            self._window = min(self._window * 2, self.SCAN_WINDOW)
+
+            # Piece i starts after all earlier pieces plus i separators;
+            # empty pieces (runs of whitespace) are dropped by compress()
+            lines = self._blank(window)
+            pieces = lines.translate(self._NEWLINES_TO_BLANK).split(b" ")
+            piece_starts = map(add, accumulate(map(len, pieces), initial=scan_pos), count())
+            starts = list(compress(piece_starts, pieces))
+            tokens = list(filter(None, pieces))
+            ends = list(map(add, starts, map(len, tokens)))
+            resume_pos = end_pos
+
+            if end_pos < self._size:
+                if lines[-1:] not in (b" ", b"\n"):
+                    if tokens and starts[-1] > scan_pos:
+                        # Last word may be cut by the window (or be a cut
+                        # UTF-8 space) -> rescan it and the whitespace before
+                        resume_pos = starts.pop()
+                        ends.pop()
+                        tokens.pop()
+                        if ends:
+                            resume_pos = ends[-1]
+                    elif tokens:
+                        # A single word longer than the window -> take it whole
+                        resume_pos = self._WORD_PATTERN.match(self._map, scan_pos).end()
+                        ends[-1] = resume_pos
+                        tokens[-1] = self._map[scan_pos:resume_pos]
+                elif tokens:
+                    # Rescan trailing whitespace with the next window, so a
+                    # paragraph break is never split between windows
+                    resume_pos = ends[-1]
+
+            self._scan_pos = resume_pos
+
+            # A window of nothing but whitespace is consumed whole, so a
+            # paragraph break may span windows: line break here and in the
+            # whitespace before the first word of a later window
+            leading = lines[:(starts[0] if starts else resume_pos) - scan_pos]
+            if self._line_break_pending and b"\n" in leading:
+                self._paragraph_pending = True
+            self._line_break_pending = not starts and (
+                self._line_break_pending or b"\n" in leading
+            )
+
+            base = len(self)
+            paragraphs = []
+            if self._paragraph_pending and tokens:
+                paragraphs.append(base)
+                self._paragraph_pending = False
+            for match in self._PARAGRAPH_BREAK.finditer(lines, 0, resume_pos - scan_pos):
+                i = bisect_left(starts, scan_pos + match.end())
+                if i < len(starts):
+                    paragraphs.append(base + i)
+                else:
+                    self._paragraph_pending = True
+
+            # In batches: each bulk call holds the GIL, so the reader loop
+            # gets a turn in between
+            for i in range(0, len(tokens), self.BATCH_WORDS):
+                j = i + self.BATCH_WORDS
+                first = bisect_left(paragraphs, base + i)
+                last = bisect_left(paragraphs, base + j)
+                self._add_spans(starts[i:j], ends[i:j], tokens[i:j], paragraphs[first:last])
+
+    def _blank(self, window: bytes) -> bytes:
+        # Every whitespace character but "\n" -> as many b" " as it has bytes
+        window = window.translate(self._SPACES_TO_BLANK)
+        if not window.isascii():
+            window = self._WIDE_SPACES_2.sub(b"  ", window)
+            window = self._WIDE_SPACES_3.sub(b"   ", window)
+        return window
+
+    def _add_spans(
+        self, starts: list[int], ends: list[int], tokens: list[bytes], paragraphs: list[int]
+    ) -> None:
+        if all(map(bytes.isascii, tokens)):
+            lengths = list(map(len, tokens))
+        else:
+            lengths = [len(t.decode("utf-8", errors="ignore")) for t in tokens]
+        punctuation = bytes(map(itemgetter(-1), tokens)).translate(PUNCTUATION_BYTE_TABLE)
+        features = self._features(lengths, punctuation, word_classes(tokens))
+
+        with self._lock:
+            self._add_features(*features)
+            self._starts.extend(starts)
+            self._ends.extend(ends)
+            for index in paragraphs:
+                self._add_paragraph_start(index)
+
+    def _word(self, index: int) -> str:
+        return self._map[self._starts[index]:self._ends[index]].decode(
+            "utf-8", errors="ignore"
+        )
+
+    def word_range(self, start: int, stop: int) -> list[str]:
+        if self._map is None:  # empty or closed
+            return []
+        return decode_words(self._map, self._starts[start:stop], self._ends[start:stop])
+
+    def export_words(self) -> tuple[bytes, array]:
+        with self._lock:
+            buffer = b"".join(map(self._map.__getitem__, map(slice, self._starts, self._ends)))
+            lengths = map(sub, self._ends, self._starts)
+            return buffer, array(self._starts.typecode, accumulate(lengths, initial=0))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._file.close()
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+
+# -----------------------------
+# Background Loading
+# -----------------------------
+class BackgroundLoader:
+    # Opens and tokenizes a word source on a worker thread. `on_ready` fires
+    # as soon as the first chunk is tokenized (reading can start right away),
+    # `on_progress` fires periodically while the rest is loaded. Callbacks run
+    # on the worker thread and are skipped once the loader is cancelled.
+    # A source cancelled before `on_ready` is handed to `close_source`.
+
+    PROGRESS_INTERVAL = 0.1  # seconds between `on_progress` calls
+
+    def __init__(
+        self,
+        open_source: Callable[[], LazyWords],
+        on_ready: Callable[["BackgroundLoader"], None],
+        on_progress: Callable[["BackgroundLoader"], None],
+        on_error: Callable[["BackgroundLoader", Exception], None],
+        on_complete: Callable[["BackgroundLoader"], None] | None = None,
+        close_source: Callable[[LazyWords], None] = LazyWords.close,
+    ) -> None:
+        self.source: LazyWords | None = None
+        self._open_source = open_source
+        self._on_ready = on_ready
+        self._on_progress = on_progress
+        self._on_error = on_error
+        self._on_complete = on_complete
+        self._close_source = close_source
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread.is_alive()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def cancel(self) -> None:
+        # The source itself stays open: once `on_ready` ran it belongs to
+        # the caller, before that the worker closes it.
+        self._cancelled.set()
+
+    def _run(self) -> None:
+        try:
+            source = self._open_source()
+            source.has(0)
+        except Exception as ex:
+            if not self.is_cancelled:
+                self._on_error(self, ex)
+            return
+
+        if self.is_cancelled:
+            self._close_source(source)
+            return
+
+        self.source = source
+        self._on_ready(self)
+
+        last_progress = time.monotonic()
+        while not source.is_complete and not self.is_cancelled:
+            try:
+                started = probes.start()
+                source.load_step()
+                probes.stop("import.tokenize", started)
+            except Exception as ex:
+                if not self.is_cancelled:
+                    self._on_error(self, ex)
+                return
+
+            now = time.monotonic()
+            if now - last_progress >= self.PROGRESS_INTERVAL:
+                last_progress = now
+                if not self.is_cancelled:
+                    self._on_progress(self)
+
+        if self.is_cancelled:
+            return
+
+        self._on_progress(self)
+        if self._on_complete is not None:
+            self._on_complete(self)
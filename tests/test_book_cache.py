@@ -0,0 +1,108 @@
+import os
+
+import pytest
+
+from book_cache import BookCache, CachedWords
+from pacing import PacingModel
+from word_store import MappedWords, StreamingWords
+
+TEXT = "Chapter One\n\nIt was a dark night. Rain, again!\n\nThe\xa0end\u3000here?\n"
+
+
+def complete_words(book_id, text=TEXT):
+    words = StreamingWords([text])
+    words.load_all()
+    words.book_id = book_id
+    return words
+
+
+def test_round_trip(tmp_path):
+    cache = BookCache(tmp_path)
+    words = complete_words("book")
+    cache.store(words)
+
+    cached = cache.load("book")
+    assert isinstance(cached, CachedWords) and cached.is_complete
+    assert len(cached) == len(words)
+    assert cached.word_range(0, len(cached)) == words.word_range(0, len(words))
+    assert [cached[i] for i in range(len(cached))] == TEXT.split()
+    for name in (
+        "lengths", "punctuation", "word_classes", "pacing_factors", "orp_pivots",
+        "sentence_starts", "paragraph_starts", "chapter_starts",
+    ):
+        assert list(getattr(cached, name)) == list(getattr(words, name)), name
+    cached.close()
+
+
+def test_round_trip_of_mapped_words(tmp_path):
+    path = tmp_path / "book.txt"
+    path.write_text(TEXT * 50, encoding="utf-8")
+    cache = BookCache(tmp_path / "cache")
+    words = MappedWords(path)
+    words.load_all()
+    words.book_id = cache.key(path)
+    cache.store(words)
+
+    cached = cache.load(words.book_id)
+    assert cached.word_range(0, len(cached)) == (TEXT * 50).split()
+    assert list(cached.paragraph_starts) == list(words.paragraph_starts)
+    cached.close()
+    words.close()
+
+
+def test_changed_pacing_recomputes_factors(tmp_path):
+    cache = BookCache(tmp_path)
+    cache.store(complete_words("book"))
+    pacing = PacingModel(length_weight=0.6, rarity_weight=0.5)
+
+    cached = cache.load("book", pacing)
+    expected = complete_words("other")
+    expected.set_pacing(pacing)
+    assert list(cached.pacing_factors) == pytest.approx(list(expected.pacing_factors))
+    assert list(cached.pacing_factors) != list(complete_words("plain").pacing_factors)
+    cached.close()
+
+
+def test_incomplete_or_unkeyed_words_are_not_stored(tmp_path):
+    cache = BookCache(tmp_path)
+    partial = StreamingWords([TEXT] * 1000)
+    partial.book_id = "partial"
+    partial.has(0)
+    cache.store(partial)
+    cache.store(complete_words(None))
+    assert list(tmp_path.glob("*.book")) == []
+    assert cache.load("partial") is None
+
+
+def test_bad_entries_are_misses(tmp_path):
+    cache = BookCache(tmp_path)
+    cache.store(complete_words("book"))
+    entry = cache.entry_path("book")
+    data = entry.read_bytes()
+
+    entry.write_bytes(b"SRBOOK00" + data[8:])  # older format
+    assert cache.load("book") is None
+    entry.write_bytes(data[:len(data) // 2])  # truncated
+    assert cache.load("book") is None
+    assert cache.load("missing") is None
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = BookCache(tmp_path)
+    for number, book_id in enumerate(("a", "b", "c")):
+        cache.store(complete_words(book_id))
+        os.utime(cache.entry_path(book_id), (number, number))
+    entry_size = cache.entry_path("a").stat().st_size
+
+    cache.load("a").close()  # -> most recently used
+    cache.max_bytes = entry_size * 3
+    cache.store(complete_words("d"))
+
+    assert sorted(p.stem for p in tmp_path.glob("*.book")) == ["a", "c", "d"]
+
+
+def test_entry_larger_than_the_cache_is_kept(tmp_path):
+    cache = BookCache(tmp_path, max_bytes=1)
+    cache.store(complete_words("a"))
+    cache.store(complete_words("b"))
+    assert [p.stem for p in tmp_path.glob("*.book")] == ["b"]
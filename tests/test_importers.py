@@ -0,0 +1,78 @@
+import importlib.util
+import runpy
+import zipfile
+
+import pytest
+
+from importers import read_docx_chunks_document, read_docx_chunks_fast
+
+W = 'xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main"'
+
+# Body content python-docx reads in part (or not at all)
+BODY = """
+<w:p><w:pPr><w:tabs><w:tab w:val="left" w:pos="720"/></w:tabs></w:pPr>
+  <w:r><w:t xml:space="preserve">Plain </w:t><w:tab/><w:t>text</w:t></w:r></w:p>
+<w:p><w:r><w:t>line</w:t><w:br/><w:t>wrap</w:t><w:br w:type="page"/>
+  <w:cr/><w:noBreakHyphen/><w:ptab w:relativeTo="margin" w:alignment="left" w:leader="none"/></w:r></w:p>
+<w:p><w:hyperlink><w:r><w:t>linked</w:t></w:r></w:hyperlink>
+  <w:ins w:id="1" w:author="a"><w:r><w:t>inserted</w:t></w:r></w:ins>
+  <w:del w:id="2" w:author="a"><w:r><w:delText>deleted</w:delText></w:r></w:del>
+  <w:sdt><w:sdtContent><w:r><w:t>control</w:t></w:r></w:sdtContent></w:sdt>
+  <w:fldSimple w:instr="PAGE"><w:r><w:t>1</w:t></w:r></w:fldSimple>
+  <w:r><w:t>after</w:t></w:r></w:p>
+<w:p><w:r><w:pict><v:shape xmlns:v="urn:schemas-microsoft-com:vml"><v:textbox>
+  <w:txbxContent><w:p><w:r><w:t>boxed</w:t></w:r></w:p></w:txbxContent>
+  </v:textbox></v:shape></w:pict><w:t>outside</w:t></w:r></w:p>
+<w:sdt><w:sdtContent><w:p><w:r><w:t>block control</w:t></w:r></w:p></w:sdtContent></w:sdt>
+<w:tbl><w:tr><w:tc><w:p><w:r><w:t>cell</w:t></w:r></w:p></w:tc></w:tr></w:tbl>
+<w:p/>
+<w:p><w:r><w:t>last</w:t></w:r></w:p>
+"""
+
+
+@pytest.fixture
+def fixture_docx(tmp_path):
+    docx = pytest.importorskip("docx")
+    path = tmp_path / "fixture.docx"
+    docx.Document().save(path)
+    with zipfile.ZipFile(path) as archive:
+        parts = {name: archive.read(name) for name in archive.namelist()}
+
+    xml = parts["word/document.xml"].decode("utf-8")
+    start = xml.index(">", xml.index("<w:body")) + 1
+    parts["word/document.xml"] = (xml[:start] + BODY + xml[start:]).encode("utf-8")
+    with zipfile.ZipFile(path, "w") as archive:
+        for name, data in parts.items():
+            archive.writestr(name, data)
+    return path
+
+
+def test_fast_docx_reader_matches_python_docx(fixture_docx):
+    fast = list(read_docx_chunks_fast(fixture_docx))
+    assert fast == list(read_docx_chunks_document(fixture_docx))
+    text = "".join(fast)
+    assert "Plain \ttext" in text and "linked" in text and "outside" in text
+    for skipped in ("inserted", "deleted", "control", "boxed", "cell"):
+        assert skipped not in text
+
+
+def registered_importers(monkeypatch, pypdf_found):
+    # The importer registrations of a fresh copy of the module
+    find_spec = importlib.util.find_spec
+    pypdf = object() if pypdf_found else None
+    monkeypatch.setattr(
+        importlib.util,
+        "find_spec",
+        lambda name, *args: pypdf if name == "pypdf" else find_spec(name, *args),
+    )
+    return runpy.run_module("importers")["IMPORTERS"]
+
+
+def test_pdf_is_left_out_without_pypdf(monkeypatch):
+    registry = registered_importers(monkeypatch, pypdf_found=False)
+    assert ".pdf" not in registry and ".docx" in registry
+
+
+def test_pdf_is_offered_with_pypdf(monkeypatch):
+    registry = registered_importers(monkeypatch, pypdf_found=True)
+    assert registry[".pdf"].name == "PDF"
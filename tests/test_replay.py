@@ -0,0 +1,31 @@
+from event_log import EventLog, read_events
+from replay import reading_runs, replay_recorded
+
+
+def test_keys_are_reported_with_the_stall_they_caused(tmp_path):
+    book = tmp_path / "book.txt"
+    book.write_text(" ".join(f"w{i}" for i in range(20)), encoding="utf-8")
+
+    now = 0.0
+    log = EventLog(tmp_path, clock=lambda: now)
+    log.open(20, None, book)
+    log.settings(600, False, 0, False)
+    log.key(" ", False, False)  # starts reading, before the run
+    log.start(0)
+    for index in range(10):
+        now = index * 0.1  # one word every 100 ms at 600 WPM
+        if index == 6:
+            log.key("Arrow Right", True, True)
+            now += 0.3  # the flash after it is 300 ms late
+        log.frame(index, index + 1)
+    log.stop(10)
+    log.close()
+
+    (run,) = reading_runs(list(read_events(log.path)))
+    assert [key.fields for key in run.keys] == [(True, True, "Arrow Right")]
+
+    report = replay_recorded(run, late=0.02)
+    worst = report["worst_frames"][0]
+    assert worst["word_index"] == 6 and worst["late_ms"] > 250
+    assert worst["keys"] == ["Ctrl+Shift+Arrow Right"]
+    assert all(frame["keys"] == [] for frame in report["worst_frames"][1:])
@@ -0,0 +1,128 @@
+import random
+from bisect import bisect_right
+
+import pytest
+
+from chunking import phrase_breaks, split_phrases
+from word_store import LazyWords, MappedWords, StreamingWords
+
+
+def test_incomplete_source_fails_when_created():
+    class NoExport(LazyWords):
+        is_complete = True
+
+        def _fill(self, wanted):
+            pass
+
+        def _word(self, index):
+            return ""
+
+        def __len__(self):
+            return 0
+
+    with pytest.raises(TypeError, match="export_words"):
+        NoExport()
+
+
+def test_streaming_words_reads_chunks_on_demand():
+    words = StreamingWords(["one two th", "ree\n\nfour"])
+    assert words[2] == "three"
+    words.load_all()
+    assert words.word_range(0, 10) == ["one", "two", "three", "four"]
+    assert list(words.paragraph_starts) == [0, 3]
+
+
+def full_chunk_starts(words, size):
+    # Chunk starts of the whole book, chunked from word 0 in one go, and its end
+    breaks = phrase_breaks(words.lengths, words.punctuation, words.paragraph_starts, 0, len(words))
+    if breaks[-1] != len(words):
+        breaks.append(len(words))
+    return [*split_phrases(breaks, size), len(words)]
+
+
+@pytest.mark.parametrize("window", [8, 16, 4096])
+def test_chunks_after_a_jump_match_chunking_from_the_start(monkeypatch, window):
+    # Phrases much longer than the window, between short ones
+    monkeypatch.setattr(LazyWords, "CHUNK_WINDOW", window)
+    rng = random.Random(window)
+    text = " ".join(
+        rng.choice(["word", "word,", "word.", "longerthantwelve", "\n\nword"])
+        if rng.random() < 0.1 else "word"
+        for _ in range(3000)
+    )
+    text += " " + "word " * 5000 + "end."
+    words = StreamingWords([text])
+    words.load_all()
+
+    for size in (2, 3, 5):
+        starts = full_chunk_starts(words, size)
+        for _ in range(200):
+            words.set_chunk_size(0)  # forget the chunks of the last jump
+            words.set_chunk_size(size)
+            index = rng.randrange(len(words))
+            while True:  # read on from the jump, chunk by chunk
+                start = index
+                index = words.chunk_end(start)
+                assert index == starts[bisect_right(starts, start)], (size, start)
+                if index == len(words) or rng.random() < 0.3:
+                    break
+
+
+# -----------------------------
+# MappedWords
+# -----------------------------
+# Every whitespace character str.split() splits on, multi-byte ones included
+WHITESPACE = " \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f\x85\xa0\u1680\u2000\u200a\u2028\u2029\u202f\u205f\u3000"
+LETTERS = "ab\xe9\u4e2d\U0001f600.,"
+
+
+@pytest.fixture
+def small_windows(monkeypatch):
+    # Scan windows of a few bytes, so words, multi-byte characters and
+    # paragraph breaks are cut between windows all the time
+    def use(window, batch=3):
+        monkeypatch.setattr(MappedWords, "MIN_SCAN_WINDOW", window)
+        monkeypatch.setattr(MappedWords, "SCAN_WINDOW", window * 2)
+        monkeypatch.setattr(MappedWords, "BATCH_WORDS", batch)
+
+    return use
+
+
+def mapped(tmp_path, text):
+    path = tmp_path / "book.txt"
+    path.write_bytes(text.encode("utf-8"))
+    words = MappedWords(path)
+    words.load_all()
+    return words
+
+
+def test_mapped_words_split_like_str_split(tmp_path, small_windows):
+    text = "one\xa0two\u2003three\u3000four\r\n\u2029five\x1csix \u205fseven"
+    for window in (4, 5, 7, 64):
+        small_windows(window)
+        words = mapped(tmp_path, text)
+        assert words.word_range(0, len(words)) == text.split()
+        words.close()
+
+
+def test_mapped_words_match_streaming_words(tmp_path, small_windows):
+    rng = random.Random(7)
+    for _ in range(200):
+        text = "".join(
+            rng.choice(WHITESPACE) if rng.random() < 0.4 else rng.choice(LETTERS)
+            for _ in range(rng.randrange(60))
+        )
+        small_windows(rng.randrange(4, 12), batch=rng.randrange(1, 5))
+        words = mapped(tmp_path, text)
+        streamed = StreamingWords([text])
+        streamed.load_all()
+        assert words.word_range(0, len(words) + 1) == text.split(), repr(text)
+        assert list(words.paragraph_starts) == list(streamed.paragraph_starts), repr(text)
+        assert list(words.lengths) == list(streamed.lengths), repr(text)
+        words.close()
+
+
+def test_mapped_words_empty_file(tmp_path):
+    words = mapped(tmp_path, "")
+    assert words.is_complete and len(words) == 0 and not words.has(0)
+    words.close()